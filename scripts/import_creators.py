@@ -1,199 +1,622 @@
+import argparse
+import hashlib
+import io
+import json
 import os
-import openpyxl
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
 import psycopg2
+from psycopg2.extras import execute_values
 
-from import_utils import parse_followers
+from import_utils import (
+    apply_column_plan,
+    cell_age,
+    cell_flag,
+    cell_phone,
+    cell_text,
+    cell_url,
+    creator_import_key,
+    normalize_handles,
+    normalize_tiktok_handle,
+    parse_decimal,
+    parse_follower_count,
+    parse_followers,
+    resolve_column_plan,
+)
+from import_sources import (
+    detect_format,
+    export_workbook_csv,
+    find_sheet,
+    iter_discovered_rows,
+    open_workbook,
+)
 
 DATABASE_URL = os.environ.get('DATABASE_URL')
 
-def import_influencers(cursor, wb):
-    influencer_sheets = {
-        'Collabs': 'Collabs',
-        'Lifestyle': 'Lifestyle', 
-        'Fashion': 'Fashion',
-        'Home': 'Home',
-        'Beauty': 'Beauty',
-        'Food ': 'Food',
-        'Car Reviews': 'Car Reviews',
-        'Moms': 'Moms',
-    }
-    
-    inserted = 0
-    for sheet_name, category in influencer_sheets.items():
-        if sheet_name not in wb.sheetnames:
+INFLUENCER_SHEETS = {
+    'Collabs': 'Collabs',
+    'Lifestyle': 'Lifestyle',
+    'Fashion': 'Fashion',
+    'Home': 'Home',
+    'Beauty': 'Beauty',
+    'Food ': 'Food',
+    'Car Reviews': 'Car Reviews',
+    'Moms': 'Moms',
+}
+
+INFLUENCER_COLUMNS = (
+    'name', 'tiktok_url', 'instagram_url', 'followers', 'niche', 'phone', 'category', 'notes',
+)
+
+# Parsed influencer rows plus the handles derived from their URLs, as loaded.
+INFLUENCER_LOAD_COLUMNS = INFLUENCER_COLUMNS + ('tiktok_handle', 'instagram_handle')
+
+UGC_COLUMNS = (
+    'name', 'phone', 'handle', 'niche', 'has_mock_video', 'portfolio_url', 'age', 'gender',
+    'languages', 'accepts_gifted_collab', 'turnaround_time', 'has_equipment',
+    'has_editing_skills', 'can_voiceover', 'skills_rating', 'base_rate',
+)
+
+# Column order of the creators base table for each parsed row shape, used by
+# the incremental upsert which writes to creators directly.
+CREATOR_INFLUENCER_COLUMNS = (
+    'display_name', 'tiktok_url', 'instagram_url', 'followers', 'primary_niche', 'phone',
+    'category', 'notes', 'tiktok_handle', 'instagram_handle',
+)
+
+CREATOR_DISCOVERED_COLUMNS = (
+    'display_name', 'tiktok_url', 'tiktok_handle', 'followers', 'status',
+)
+
+CREATOR_UGC_COLUMNS = (
+    'display_name', 'phone', 'handle', 'primary_niche', 'has_mock_video', 'portfolio_url',
+    'age', 'gender', 'languages', 'accepts_gifted_collab', 'turnaround_time', 'has_equipment',
+    'has_editing_skills', 'can_voiceover', 'skills_rating', 'base_rate',
+)
+
+# Header -> field rules, checked in order against the lowercased header; the
+# first match claims the column. The order mirrors the original elif chains,
+# so e.g. "Languages" is still claimed by the 'age' rule.
+INFLUENCER_COLUMN_RULES = (
+    ('tiktok_url', ('tiktok', 'username'), (), cell_url('tiktok.com')),
+    ('instagram_url', ('instagram',), (), cell_url('instagram.com')),
+    ('followers', ('follower',), (), parse_followers),
+    ('niche', ('industry', 'niche'), (), cell_text),
+    ('phone', ('phone', 'contact'), (), cell_phone),
+    ('notes', ('comment', 'rate'), (), cell_text),
+)
+
+UGC_COLUMN_RULES = (
+    ('phone', ('number',), ('follower',), cell_phone),
+    ('handle', ('handle',), (), cell_text),
+    ('niche', ('niche',), (), cell_text),
+    ('has_mock_video', ('mock',), (), cell_flag),
+    ('portfolio_url', ('portfolio',), (), cell_text),
+    ('age', ('age',), (), cell_age),
+    ('gender', ('gender',), (), cell_text),
+    ('languages', ('language',), (), cell_text),
+    ('accepts_gifted_collab', ('gifted',), (), cell_flag),
+    ('turnaround_time', ('turnaround',), (), cell_text),
+    ('has_equipment', ('equipment',), (), cell_flag),
+    ('has_editing_skills', ('editing',), (), cell_flag),
+    ('can_voiceover', ('voiceover',), (), cell_flag),
+    ('skills_rating', ('rating',), (), cell_text),
+    ('base_rate', ('rate',), ('rating',), cell_text),
+)
+
+UGC_DEFAULTS = (
+    None, None, None, None, False, None, None, None,
+    None, False, None, False,
+    False, False, None, None,
+)
+
+def _report_unmapped(sheet_name, headers, unmapped):
+    # The first column is always the creator name.
+    ignored = [header for header in unmapped if header is not None and header != headers[0]]
+    if ignored:
+        print(f"Unmapped columns in {sheet_name}: {ignored}")
+
+def _sheet_rows(ws):
+    # Read-only sheets trust the dimensions stored in the file, which some
+    # exports get wrong; re-derive them from the rows as they stream past.
+    if hasattr(ws, 'reset_dimensions'):
+        ws.reset_dimensions()
+    rows = ws.iter_rows(values_only=True)
+    headers = list(next(rows, ()))
+    return headers, rows
+
+def parse_influencer_sheet(wb, sheet_name, category):
+    headers, rows = _sheet_rows(wb[sheet_name])
+    print(f"Processing sheet: {sheet_name}, headers: {headers[:7]}")
+    plan, unmapped = resolve_column_plan(headers, INFLUENCER_COLUMNS, INFLUENCER_COLUMN_RULES)
+    _report_unmapped(sheet_name, headers, unmapped)
+
+    for row in rows:
+        if not row or not row[0]:
+            continue
+
+        name = str(row[0]).strip() if row[0] else None
+        if not name:
+            continue
+
+        record = apply_column_plan(row, plan, [None] * len(INFLUENCER_COLUMNS), skip_falsy=True)
+        record[0] = name
+        record[6] = category
+        if not record[4]:
+            record[4] = category
+
+        yield tuple(record)
+
+def parse_influencer_rows(wb):
+    for sheet_name, category in INFLUENCER_SHEETS.items():
+        actual = find_sheet(wb, sheet_name)
+        if actual is None:
             print(f"Sheet '{sheet_name}' not found, skipping...")
             continue
-            
-        ws = wb[sheet_name]
-        headers = [cell.value for cell in ws[1]]
-        print(f"Processing sheet: {sheet_name}, headers: {headers[:7]}")
-        
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if not row or not row[0]:
-                continue
-                
-            name = str(row[0]).strip() if row[0] else None
-            if not name:
-                continue
-            
-            tiktok_url = None
-            instagram_url = None
-            followers = None
-            niche = None
-            phone = None
-            notes = None
-            
-            for i, header in enumerate(headers):
-                if i >= len(row):
-                    break
-                val = row[i]
-                if not val:
-                    continue
-                    
-                header_lower = str(header).lower() if header else ''
-                
-                if 'tiktok' in header_lower or 'username' in header_lower:
-                    if 'tiktok.com' in str(val):
-                        tiktok_url = str(val)
-                elif 'instagram' in header_lower:
-                    if 'instagram.com' in str(val):
-                        instagram_url = str(val)
-                elif 'follower' in header_lower:
-                    followers = parse_followers(val)
-                elif 'industry' in header_lower or 'niche' in header_lower:
-                    niche = str(val) if val else None
-                elif 'phone' in header_lower or 'contact' in header_lower:
-                    if val and str(val).replace('.', '').replace('-', '').isdigit():
-                        phone = str(int(float(val))) if isinstance(val, float) else str(val)
-                elif 'comment' in header_lower or 'rate' in header_lower:
-                    notes = str(val) if val else None
-            
-            if not niche:
-                niche = category
-                
-            cursor.execute("""
-                INSERT INTO influencers (name, tiktok_url, instagram_url, followers, niche, phone, category, notes)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (name, tiktok_url, instagram_url, followers, niche, phone, category, notes))
-            inserted += 1
-    
-    return inserted
+        yield from parse_influencer_sheet(wb, actual, category)
 
-def import_ugc_creators(cursor, wb):
-    if 'UGC' not in wb.sheetnames:
+def parse_ugc_rows(wb):
+    sheet_name = find_sheet(wb, 'UGC')
+    if sheet_name is None:
         print("UGC sheet not found")
-        return 0
-        
-    ws = wb['UGC']
-    headers = [cell.value for cell in ws[1]]
+        return
+
+    headers, rows = _sheet_rows(wb[sheet_name])
     print(f"UGC headers: {headers}")
-    
-    inserted = 0
-    for row in ws.iter_rows(min_row=2, values_only=True):
+    plan, unmapped = resolve_column_plan(headers, UGC_COLUMNS, UGC_COLUMN_RULES)
+    _report_unmapped('UGC', headers, unmapped)
+
+    for row in rows:
         if not row or not row[0]:
             continue
-            
+
         name = str(row[0]).strip() if row[0] else None
         if not name:
             continue
-        
-        phone = None
-        handle = None
-        niche = None
-        has_mock_video = False
-        portfolio_url = None
-        age = None
-        gender = None
-        languages = None
-        accepts_gifted = False
-        turnaround = None
-        has_equipment = False
-        has_editing = False
-        can_voiceover = False
-        skills_rating = None
-        base_rate = None
-        
-        for i, header in enumerate(headers):
-            if i >= len(row):
-                break
-            val = row[i]
-            if val is None:
-                continue
-                
-            header_lower = str(header).lower() if header else ''
-            
-            if 'number' in header_lower and 'follower' not in header_lower:
-                if val and str(val).replace('.', '').replace('-', '').isdigit():
-                    phone = str(int(float(val))) if isinstance(val, float) else str(val)
-            elif 'handle' in header_lower:
-                handle = str(val) if val else None
-            elif 'niche' in header_lower:
-                niche = str(val) if val else None
-            elif 'mock' in header_lower:
-                has_mock_video = bool(val)
-            elif 'portfolio' in header_lower:
-                portfolio_url = str(val) if val else None
-            elif 'age' in header_lower:
-                try:
-                    age = int(float(val)) if val and str(val).replace('.','').isdigit() else None
-                except (ValueError, TypeError):
-                    age = None
-            elif 'gender' in header_lower:
-                gender = str(val) if val else None
-            elif 'language' in header_lower:
-                languages = str(val) if val else None
-            elif 'gifted' in header_lower:
-                accepts_gifted = bool(val)
-            elif 'turnaround' in header_lower:
-                turnaround = str(val) if val else None
-            elif 'equipment' in header_lower:
-                has_equipment = bool(val)
-            elif 'editing' in header_lower:
-                has_editing = bool(val)
-            elif 'voiceover' in header_lower:
-                can_voiceover = bool(val)
-            elif 'rating' in header_lower:
-                skills_rating = str(val) if val else None
-            elif 'rate' in header_lower and 'rating' not in header_lower:
-                base_rate = str(val) if val else None
-        
+
+        record = apply_column_plan(row, plan, list(UGC_DEFAULTS), skip_falsy=False)
+        record[0] = name
+
+        yield tuple(record)
+
+def _parse_sheet_job(path, fmt, sheet_name, category):
+    # Runs in a worker process, so it opens its own handle on the workbook.
+    wb = open_workbook(path, fmt)
+    try:
+        if category is None:
+            return list(parse_ugc_rows(wb))
+        return list(parse_influencer_sheet(wb, sheet_name, category))
+    finally:
+        wb.close()
+
+def parse_sheets_parallel(path, fmt, wb, workers):
+    jobs = []
+    for sheet_name, category in INFLUENCER_SHEETS.items():
+        actual = find_sheet(wb, sheet_name)
+        if actual is None:
+            print(f"Sheet '{sheet_name}' not found, skipping...")
+            continue
+        jobs.append((actual, category))
+    if find_sheet(wb, 'UGC') is not None:
+        jobs.append(('UGC', None))
+    else:
+        print("UGC sheet not found")
+
+    influencer_rows = []
+    ugc_rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_parse_sheet_job, path, fmt, name, category) for name, category in jobs
+        ]
+        # Collect in submission order so rows land in the same order as a serial run.
+        for (_, category), future in zip(jobs, futures):
+            rows = future.result()
+            if category is None:
+                ugc_rows.extend(rows)
+            else:
+                influencer_rows.extend(rows)
+    return influencer_rows, ugc_rows
+
+def with_handles(rows, batch_size=5000):
+    # Appends (tiktok_handle, instagram_handle), normalized one chunk at a time
+    # so a streamed sheet is never held in memory whole.
+    for batch in _batched(rows, batch_size):
+        tiktok_handles = normalize_handles([row[1] for row in batch], 'tiktok')
+        instagram_handles = normalize_handles([row[2] for row in batch], 'instagram')
+        for row, handles in zip(batch, zip(tiktok_handles, instagram_handles)):
+            yield tuple(row) + handles
+
+def import_influencers(cursor, rows):
+    inserted = 0
+    for row in with_handles(rows):
+        cursor.execute("""
+            INSERT INTO influencers (name, tiktok_url, instagram_url, followers, niche, phone, category, notes,
+                                     tiktok_handle, instagram_handle)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, row)
+        inserted += 1
+
+    return inserted
+
+def import_ugc_creators(cursor, rows):
+    inserted = 0
+    for row in rows:
         cursor.execute("""
-            INSERT INTO ugc_creators (name, phone, handle, niche, has_mock_video, portfolio_url, age, gender, 
-                                       languages, accepts_gifted_collab, turnaround_time, has_equipment, 
+            INSERT INTO ugc_creators (name, phone, handle, niche, has_mock_video, portfolio_url, age, gender,
+                                       languages, accepts_gifted_collab, turnaround_time, has_equipment,
                                        has_editing_skills, can_voiceover, skills_rating, base_rate)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (name, phone, handle, niche, has_mock_video, portfolio_url, age, gender, 
-              languages, accepts_gifted, turnaround, has_equipment, has_editing, can_voiceover, 
-              skills_rating, base_rate))
+        """, row)
         inserted += 1
-    
+
+    return inserted
+
+def _batched(rows, size):
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def _copy_value(value):
+    # COPY text format: \N is NULL, and tabs/newlines/backslashes must be escaped.
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+def copy_rows(cursor, table, columns, rows):
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_value(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+def resolve_bulk_method(cursor, table, method):
+    if method != 'auto':
+        return method
+    # COPY only targets plain/partitioned tables; views (e.g. the supabase
+    # influencers/ugc_creators views over creators) need INSERT.
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = %s::regclass", (table,))
+    relkind = cursor.fetchone()[0]
+    return 'copy' if relkind in ('r', 'p') else 'values'
+
+def bulk_insert(cursor, table, columns, rows, batch_size=5000, method='auto'):
+    method = resolve_bulk_method(cursor, table, method)
+    insert_sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+    inserted = 0
+    for batch in _batched(rows, batch_size):
+        if method == 'copy':
+            copy_rows(cursor, table, columns, batch)
+        else:
+            execute_values(cursor, insert_sql, batch, page_size=len(batch))
+        inserted += len(batch)
+    print(f"Loaded {inserted} rows into {table} via {method}")
     return inserted
 
-def main():
-    print("Loading Excel file...")
-    wb = openpyxl.load_workbook('attached_assets/Kreate&co_Creator_Network_1770117705423.xlsx')
+def influencer_creator_records(rows):
+    for row in with_handles(rows):
+        name, tiktok_url, instagram_url, followers, niche, phone, category, notes = row[:8]
+        key = creator_import_key(
+            'Influencer', tiktok_url=tiktok_url, instagram_url=instagram_url,
+            phone=phone, name=name, category=category,
+        )
+        yield key, (name, tiktok_url, instagram_url, parse_follower_count(followers), niche,
+                    phone, category, notes) + row[8:]
+
+def _join_distinct(*values):
+    # "Lifestyle" + "Fashion, Beauty" -> "Lifestyle, Fashion, Beauty", first spelling kept.
+    seen = {}
+    for value in values:
+        for part in str(value or '').split(','):
+            part = part.strip()
+            if part and part.lower() not in seen:
+                seen[part.lower()] = part
+    return ', '.join(seen.values()) or None
+
+def merge_influencer_values(previous, values):
+    # The same creator listed on several category sheets shares one import
+    # key: keep a single row that lists every niche/category it appears
+    # under; other fields take the latest non-empty value.
+    merged = list(values)
+    for index, (old, new) in enumerate(zip(previous, values)):
+        if index in (4, 6):
+            merged[index] = _join_distinct(old, new)
+        elif new in (None, '') and old not in (None, ''):
+            merged[index] = old
+    return tuple(merged)
+
+def ugc_creator_records(rows):
+    for row in rows:
+        values = list(row)
+        name, phone, handle, niche = values[:4]
+        values[14] = parse_decimal(values[14])
+        values[15] = parse_decimal(values[15])
+        key = creator_import_key('UGC', handle=handle, phone=phone, name=name, category=niche)
+        yield key, tuple(values)
+
+def _row_hash(values):
+    payload = json.dumps(values, default=str, ensure_ascii=False)
+    return hashlib.md5(payload.encode('utf-8')).hexdigest()
+
+def adopt_unkeyed_creators(cursor, creator_type, batch_size=5000):
+    # Rows written before import_key existed (seed data, earlier full loads)
+    # get their key from the same creator_import_key rules, so the first
+    # incremental run updates them instead of inserting a second copy. When
+    # several un-keyed rows (or an already keyed one) share a key, the oldest
+    # keeps it and the extra copies are soft-deleted.
+    cursor.execute("""
+        SELECT import_key FROM creators
+        WHERE creator_type = %s AND import_key IS NOT NULL
+    """, (creator_type,))
+    taken = {key for (key,) in cursor.fetchall()}
+    cursor.execute("""
+        SELECT id, display_name, tiktok_url, instagram_url, handle, phone, category, primary_niche
+        FROM creators
+        WHERE creator_type = %s AND import_key IS NULL
+        ORDER BY created_at, id
+    """, (creator_type,))
+    adopted = []
+    duplicates = []
+    for row_id, name, tiktok_url, instagram_url, handle, phone, category, niche in cursor.fetchall():
+        if creator_type == 'UGC':
+            key = creator_import_key(creator_type, handle=handle, phone=phone, name=name, category=niche)
+        else:
+            key = creator_import_key(
+                creator_type, tiktok_url=tiktok_url, instagram_url=instagram_url,
+                phone=phone, name=name, category=category,
+            )
+        if key in taken:
+            duplicates.append((str(row_id),))
+        else:
+            taken.add(key)
+            adopted.append((str(row_id), key))
+    for batch in _batched(adopted, batch_size):
+        execute_values(cursor, """
+            UPDATE creators AS c SET import_key = v.import_key, updated_at = now()
+            FROM (VALUES %s) AS v(id, import_key)
+            WHERE c.id = v.id::uuid
+        """, batch, page_size=len(batch))
+    for batch in _batched(duplicates, batch_size):
+        execute_values(cursor, """
+            UPDATE creators AS c SET removed_at = now(), updated_at = now()
+            FROM (VALUES %s) AS v(id)
+            WHERE c.id = v.id::uuid AND c.removed_at IS NULL
+        """, batch, page_size=len(batch))
+    if adopted or duplicates:
+        print(f"{creator_type}: keyed {len(adopted)} existing rows, "
+              f"soft-deleted {len(duplicates)} duplicate copies")
+    return len(adopted), len(duplicates)
+
+def upsert_creators(cursor, creator_type, columns, records, prune=False, batch_size=5000,
+                    update_where=None, merge=None, extra_updates=()):
+    # Rows sharing a key describe one creator. Without `merge` the later row
+    # wins; with it, merge(previous, values) combines them.
+    latest = {}
+    duplicates = 0
+    for key, values in records:
+        previous = latest.get(key)
+        if previous is not None:
+            duplicates += 1
+            if merge is not None:
+                values = merge(previous, values)
+        latest[key] = values
+
+    adopt_unkeyed_creators(cursor, creator_type, batch_size)
+    cursor.execute("""
+        SELECT import_key, import_hash, removed_at IS NOT NULL
+        FROM creators
+        WHERE creator_type = %s AND import_key IS NOT NULL
+    """, (creator_type,))
+    existing = {key: (digest, removed) for key, digest, removed in cursor.fetchall()}
+
+    changed = []
+    for key, values in latest.items():
+        digest = _row_hash(values)
+        current = existing.get(key)
+        if current and current[0] == digest and not current[1]:
+            continue
+        changed.append(values + (creator_type, key, digest))
+
+    all_columns = columns + ('creator_type', 'import_key', 'import_hash')
+    updates = ', '.join(
+        [f"{column} = EXCLUDED.{column}" for column in columns + ('import_hash',)] + list(extra_updates)
+    )
+    condition = f"WHERE {update_where}" if update_where else ''
+    upsert_sql = f"""
+        INSERT INTO creators ({', '.join(all_columns)}) VALUES %s
+        ON CONFLICT (import_key) DO UPDATE
+        SET {updates}, removed_at = NULL, updated_at = now()
+        {condition}
+        RETURNING 1
+    """
+    # Rows the update_where guard leaves alone return nothing, so only rows
+    # actually written are counted.
+    written = 0
+    for batch in _batched(changed, batch_size):
+        written += len(execute_values(cursor, upsert_sql, batch, page_size=len(batch), fetch=True))
+
+    removed = 0
+    if prune:
+        # Discovered creators come from the crawler, not the sheet; a sheet
+        # import never prunes them.
+        cursor.execute("""
+            UPDATE creators
+            SET removed_at = now(), updated_at = now()
+            WHERE creator_type = %s
+              AND import_key IS NOT NULL
+              AND removed_at IS NULL
+              AND status IS DISTINCT FROM 'discovered'
+              AND NOT (import_key = ANY(%s))
+        """, (creator_type, list(latest)))
+        removed = cursor.rowcount
+
+    if duplicates:
+        print(f"{creator_type}: {duplicates} duplicate rows merged into {len(latest)} creators")
+    skipped = f", {len(changed) - written} kept (curated)" if written < len(changed) else ''
+    print(f"{creator_type}: {len(latest)} in sheet, {written} upserted, "
+          f"{len(latest) - len(changed)} unchanged{skipped}, {removed} soft-deleted")
+    return written, removed
+
+def import_incremental(cursor, influencer_rows, ugc_rows, prune=False, batch_size=5000):
+    print("\nUpserting influencers...")
+    influencer_changes, _ = upsert_creators(
+        cursor, 'Influencer', CREATOR_INFLUENCER_COLUMNS,
+        influencer_creator_records(influencer_rows),
+        prune=prune, batch_size=batch_size, merge=merge_influencer_values,
+        # A curated row stops being 'discovered', so later discovery imports
+        # no longer overwrite it.
+        extra_updates=("status = NULLIF(creators.status, 'discovered')",),
+    )
+    print("\nUpserting UGC creators...")
+    ugc_changes, _ = upsert_creators(
+        cursor, 'UGC', CREATOR_UGC_COLUMNS,
+        ugc_creator_records(ugc_rows),
+        prune=prune, batch_size=batch_size,
+    )
+    return influencer_changes + ugc_changes
+
+def discovered_creator_records(rows):
+    for name, username, profile_url, followers in rows:
+        key = creator_import_key('Influencer', tiktok_url=profile_url, handle=username)
+        handle = normalize_tiktok_handle(profile_url) or (
+            normalize_tiktok_handle(f"@{username}") if username else None
+        )
+        yield key, (name or username, profile_url, handle, parse_follower_count(followers),
+                    'discovered')
+
+def import_discovered(cursor, path, batch_size=5000):
+    # Discovered creators never overwrite curated rows that share their key,
+    # only earlier discovery results.
+    changed, _ = upsert_creators(
+        cursor, 'Influencer', CREATOR_DISCOVERED_COLUMNS,
+        discovered_creator_records(iter_discovered_rows(path)),
+        batch_size=batch_size, update_where="creators.status = 'discovered'",
+    )
+    return changed
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Import the creator network workbook into PostgreSQL')
+    parser.add_argument('--input', type=str, default='attached_assets/Kreate&co_Creator_Network_1770117705423.xlsx',
+                        help='Workbook (.xlsx), per-sheet CSV/Parquet file or directory, or a discovery CSV')
+    parser.add_argument('--format', choices=['auto', 'xlsx', 'csv', 'parquet', 'discovered'], default='auto')
+    parser.add_argument('--export-csv', type=str, default='',
+                        help='Convert the workbook sheets to CSV files in this directory and exit')
+    parser.add_argument('--bulk', action='store_true', help='Load rows in batches via COPY/execute_values')
+    parser.add_argument('--bulk-method', choices=['auto', 'copy', 'values'], default='auto')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--incremental', action='store_true',
+                        help='Upsert changed creators by stable key instead of replacing all rows')
+    parser.add_argument('--prune', action='store_true',
+                        help='With --incremental, soft-delete creators missing from the sheet')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Parse sheets in this many worker processes (1 = serial, streaming)')
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.prune and not args.incremental:
+        parser.error('--prune requires --incremental')
+
+    fmt = detect_format(args.input) if args.format == 'auto' else args.format
+
+    if args.export_csv:
+        sheet_names = list(INFLUENCER_SHEETS) + ['UGC']
+        for path in export_workbook_csv(args.input, args.export_csv, sheet_names):
+            print(f"Wrote {path}")
+        return
+
+    if fmt == 'discovered':
+        if args.prune:
+            parser.error('--prune is not supported for discovery CSV input')
+        print("\nConnecting to database...")
+        conn = psycopg2.connect(DATABASE_URL)
+        cursor = conn.cursor()
+        try:
+            started = time.perf_counter()
+            changed = import_discovered(cursor, args.input, batch_size=args.batch_size)
+            conn.commit()
+            print(f"\nDiscovery import completed! {changed} rows changed in "
+                  f"{time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            conn.rollback()
+            print(f"Error: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+        return
+
+    print(f"Loading {fmt} input...")
+    # Workbooks are opened read-only, which streams rows from the sheets we ask
+    # for instead of materializing every cell up front.
+    wb = open_workbook(args.input, fmt)
     print(f"Sheets: {wb.sheetnames}")
-    
+
     print("\nConnecting to database...")
     conn = psycopg2.connect(DATABASE_URL)
     cursor = conn.cursor()
-    
+
     try:
+        started = time.perf_counter()
+        if args.workers > 1:
+            influencer_rows, ugc_rows = parse_sheets_parallel(args.input, fmt, wb, args.workers)
+            print(f"Parsed {len(influencer_rows) + len(ugc_rows)} rows with {args.workers} workers "
+                  f"in {time.perf_counter() - started:.2f}s")
+        else:
+            influencer_rows, ugc_rows = parse_influencer_rows(wb), parse_ugc_rows(wb)
+
+        if args.incremental:
+            changed = import_incremental(
+                cursor, influencer_rows, ugc_rows, prune=args.prune, batch_size=args.batch_size,
+            )
+            conn.commit()
+            elapsed = time.perf_counter() - started
+            print(f"\nIncremental import completed! {changed} rows changed in {elapsed:.2f}s")
+            return
+
         cursor.execute("DELETE FROM influencers")
         cursor.execute("DELETE FROM ugc_creators")
         print("Cleared existing data")
-        
+
         print("\nImporting influencers...")
-        influencer_count = import_influencers(cursor, wb)
+        if args.bulk:
+            influencer_count = bulk_insert(
+                cursor, 'influencers', INFLUENCER_LOAD_COLUMNS, with_handles(influencer_rows, args.batch_size),
+                batch_size=args.batch_size, method=args.bulk_method,
+            )
+        else:
+            influencer_count = import_influencers(cursor, influencer_rows)
         print(f"Imported {influencer_count} influencers")
-        
+
         print("\nImporting UGC creators...")
-        ugc_count = import_ugc_creators(cursor, wb)
+        if args.bulk:
+            ugc_count = bulk_insert(
+                cursor, 'ugc_creators', UGC_COLUMNS, ugc_rows,
+                batch_size=args.batch_size, method=args.bulk_method,
+            )
+        else:
+            ugc_count = import_ugc_creators(cursor, ugc_rows)
         print(f"Imported {ugc_count} UGC creators")
-        
+
         conn.commit()
-        print("\nImport completed successfully!")
-        
+        elapsed = time.perf_counter() - started
+        total = influencer_count + ugc_count
+        rate = total / elapsed if elapsed > 0 else float(total)
+        print(f"\nImport completed successfully! {total} rows in {elapsed:.2f}s ({rate:.0f} rows/s)")
+
     except Exception as e:
         conn.rollback()
         print(f"Error: {e}")
@@ -201,6 +624,7 @@ def main():
     finally:
         cursor.close()
         conn.close()
+        wb.close()
 
 if __name__ == '__main__':
     main()
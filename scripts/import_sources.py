@@ -0,0 +1,174 @@
+import csv
+import os
+import re
+
+import openpyxl
+
+# Header of the CSV written by the TikTok discovery scripts
+# (tiktok_fetch_creators_eg.py, tiktok_fetch_search_creators_all.py).
+DISCOVERED_HEADERS = ['name', 'username', 'profile_url', 'followers_count']
+
+TABLE_EXTENSIONS = ('.csv', '.parquet')
+
+DECIMAL_CELL = re.compile(r'-?\d+\.\d+')
+# No leading zero, so phone numbers such as "0100..." stay text.
+INTEGER_CELL = re.compile(r'-?(?:0|[1-9]\d*)')
+
+
+def detect_format(path):
+    if os.path.isdir(path):
+        return 'csv'
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.xlsx', '.xlsm'):
+        return 'xlsx'
+    if extension == '.parquet':
+        return 'parquet'
+    if extension == '.csv':
+        with open(path, encoding='utf-8-sig', newline='') as handle:
+            header = next(csv.reader(handle), [])
+        return 'discovered' if header == DISCOVERED_HEADERS else 'csv'
+    raise SystemExit(f"Cannot tell the input format of {path}; pass --format")
+
+
+def open_workbook(path, fmt='auto'):
+    if fmt == 'auto':
+        fmt = detect_format(path)
+    if fmt == 'xlsx':
+        return openpyxl.load_workbook(path, read_only=True)
+    if fmt in ('csv', 'parquet'):
+        return TableWorkbook(path)
+    raise SystemExit(f"Input format {fmt!r} is not a workbook")
+
+
+def _csv_cell(value):
+    # CSV has no types: blanks are empty cells, Excel booleans come back as
+    # TRUE/FALSE, Excel floats as "123.0" and integers as "123". Numbers are
+    # turned back into numbers so the cell converters see what openpyxl would
+    # give them (a 0 cell stays falsy); zero-padded digits stay strings so
+    # phone numbers keep their leading zeros.
+    if value == '':
+        return None
+    upper = value.upper()
+    if upper == 'TRUE':
+        return True
+    if upper == 'FALSE':
+        return False
+    if DECIMAL_CELL.fullmatch(value):
+        return float(value)
+    if INTEGER_CELL.fullmatch(value):
+        return int(value)
+    return value
+
+
+class TableSheet:
+    def __init__(self, path):
+        self.path = path
+
+    def iter_rows(self, values_only=True):
+        if self.path.lower().endswith('.parquet'):
+            yield from self._parquet_rows()
+            return
+        with open(self.path, encoding='utf-8-sig', newline='') as handle:
+            reader = csv.reader(handle)
+            yield tuple(next(reader, ()))
+            for row in reader:
+                yield tuple(_csv_cell(value) for value in row)
+
+    def _parquet_rows(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet input requires pyarrow (pip install pyarrow)")
+        parquet_file = pq.ParquetFile(self.path)
+        yield tuple(parquet_file.schema_arrow.names)
+        for batch in parquet_file.iter_batches():
+            columns = [column.to_pylist() for column in batch.columns]
+            for row in zip(*columns):
+                # Spreadsheet-derived Parquet is often all-string; treat those
+                # cells exactly like CSV ones.
+                yield tuple(_csv_cell(value) if isinstance(value, str) else value for value in row)
+
+
+# A directory of per-sheet CSV/Parquet files (or a single file named after its
+# sheet) exposed through the part of the openpyxl workbook API the importer uses.
+class TableWorkbook:
+    def __init__(self, path):
+        if os.path.isdir(path):
+            names = sorted(os.listdir(path))
+            files = [os.path.join(path, name) for name in names]
+        else:
+            files = [path]
+        self._sheets = {}
+        for file_path in files:
+            stem, extension = os.path.splitext(os.path.basename(file_path))
+            if extension.lower() in TABLE_EXTENSIONS:
+                self._sheets[stem] = file_path
+        self.sheetnames = list(self._sheets)
+
+    def __getitem__(self, name):
+        return TableSheet(self._sheets[name])
+
+    def close(self):
+        pass
+
+
+def find_sheet(wb, sheet_name):
+    # Workbook tabs carry stray whitespace ('Food '), exported file names don't.
+    if sheet_name in wb.sheetnames:
+        return sheet_name
+    wanted = sheet_name.strip().lower()
+    for candidate in wb.sheetnames:
+        if candidate.strip().lower() == wanted:
+            return candidate
+    return None
+
+
+def _export_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    return str(value)
+
+
+def export_workbook_csv(path, output_dir, sheet_names):
+    wb = openpyxl.load_workbook(path, read_only=True)
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    try:
+        for sheet_name in sheet_names:
+            actual = find_sheet(wb, sheet_name)
+            if actual is None:
+                continue
+            ws = wb[actual]
+            ws.reset_dimensions()
+            output_path = os.path.join(output_dir, f"{actual.strip()}.csv")
+            rows = ws.iter_rows(values_only=True)
+            headers = next(rows, ())
+            width = len(headers)
+            with open(output_path, 'w', encoding='utf-8', newline='') as handle:
+                writer = csv.writer(handle)
+                writer.writerow([_export_cell(value) for value in headers])
+                # Cells past the header row are never mapped; pad/trim so the
+                # file is rectangular for CSV/Parquet tooling.
+                for row in rows:
+                    cells = [_export_cell(value) for value in row[:width]]
+                    writer.writerow(cells + [''] * (width - len(cells)))
+            written.append(output_path)
+    finally:
+        wb.close()
+    return written
+
+
+def iter_discovered_rows(path):
+    with open(path, encoding='utf-8-sig', newline='') as handle:
+        for row in csv.DictReader(handle):
+            username = (row.get('username') or '').strip().lstrip('@')
+            if not username:
+                continue
+            yield (
+                (row.get('name') or '').strip() or None,
+                username,
+                (row.get('profile_url') or '').strip() or f"https://www.tiktok.com/@{username}",
+                (row.get('followers_count') or '').strip() or None,
+            )
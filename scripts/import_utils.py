@@ -8,15 +8,180 @@ def parse_followers(value):
     return value
 
 
+def parse_follower_count(value):
+    # Sheet values are free text such as "12.3k", "1.2M" or "11k ig/ 17.2k tt";
+    # keep the largest figure mentioned.
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    counts = []
+    for number, suffix in re.findall(r'(\d+(?:[.,]\d+)*)\s*([kKmM]?)', str(value)):
+        try:
+            count = float(number.replace(',', ''))
+        except ValueError:
+            continue
+        if suffix in ('k', 'K'):
+            count *= 1_000
+        elif suffix in ('m', 'M'):
+            count *= 1_000_000
+        counts.append(int(count))
+    return max(counts) if counts else None
+
+
+def parse_decimal(value):
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    match = re.search(r'\d+(?:\.\d+)?', str(value).replace(',', ''))
+    return float(match.group(0)) if match else None
+
+
+# Returned by cell converters when a value should leave the field untouched.
+SKIP = object()
+
+
+def cell_text(value):
+    return str(value) if value else None
+
+
+def cell_flag(value):
+    return bool(value)
+
+
+def cell_phone(value):
+    if value and str(value).replace('.', '').replace('-', '').isdigit():
+        return str(int(float(value))) if isinstance(value, float) else str(value)
+    return SKIP
+
+
+def cell_age(value):
+    try:
+        return int(float(value)) if value and str(value).replace('.', '').isdigit() else None
+    except (ValueError, TypeError):
+        return None
+
+
+def cell_url(domain):
+    def convert(value):
+        return str(value) if domain in str(value) else SKIP
+    return convert
+
+
+def resolve_column_plan(headers, fields, rules):
+    # rules: ordered (field, include terms, exclude terms, converter); the first
+    # rule whose include term appears in the lowercased header claims the column.
+    slots = {field: slot for slot, field in enumerate(fields)}
+    plan = []
+    unmapped = []
+    for index, header in enumerate(headers):
+        header_lower = str(header).lower() if header else ''
+        for field, include, exclude, convert in rules:
+            if any(term in header_lower for term in include) and not any(
+                term in header_lower for term in exclude
+            ):
+                plan.append((index, slots[field], convert))
+                break
+        else:
+            unmapped.append(header)
+    return plan, unmapped
+
+
+def apply_column_plan(row, plan, record, skip_falsy):
+    width = len(row)
+    for index, slot, convert in plan:
+        if index >= width:
+            break
+        value = row[index]
+        if (not value) if skip_falsy else (value is None):
+            continue
+        converted = convert(value)
+        if converted is not SKIP:
+            record[slot] = converted
+    return record
+
+
+# Compiled once; these run over every URL cell of the workbook.
+_TIKTOK_URL_HANDLE = re.compile(r'tiktok\.com/@([^?/]+)')
+_INSTAGRAM_URL_HANDLE = re.compile(r'instagram\.com/([^?/]+)')
+
+
 def extract_tiktok_handle(url):
+    # Import keys are built from this exact match; keep it stable so existing
+    # creators.import_key values still line up. Use normalize_tiktok_handle
+    # for the stored handle columns.
     if not url:
         return None
-    match = re.search(r'tiktok\\.com/@([^?/]+)', str(url))
+    match = _TIKTOK_URL_HANDLE.search(str(url))
     return f"@{match.group(1)}" if match else None
 
 
 def extract_instagram_handle(url):
     if not url:
         return None
-    match = re.search(r'instagram\\.com/([^?/]+)', str(url))
+    match = _INSTAGRAM_URL_HANDLE.search(str(url))
     return f"@{match.group(1)}" if match else None
+
+
+# Profile handles as stored in creators.tiktok_handle / instagram_handle:
+# lowercase, no '@'. Matches www./m. hosts, any scheme or none, query strings
+# and fragments, and bare "@name" cells. vm./vt.tiktok.com short links only
+# carry a redirect code, so they cannot be resolved offline and give None.
+_TIKTOK_HANDLE = re.compile(
+    r'^\s*(?:(?:https?://)?(?:(?:www|m)\.)?tiktok\.com/)?@([a-z0-9_.]{2,24})(?=[/?#\s]|$)',
+    re.IGNORECASE,
+)
+_INSTAGRAM_HANDLE = re.compile(
+    r'^\s*(?:(?:(?:https?://)?(?:(?:www|m)\.)?(?:instagram\.com|instagr\.am)/)|@)'
+    r'(?!(?:p|reel|reels|stories|explore|tv|accounts|direct)(?:[/?#]|$))'
+    r'([a-z0-9_.]{1,30})(?=[/?#\s]|$)',
+    re.IGNORECASE,
+)
+
+
+def _normalize_handle(pattern, value):
+    if not value:
+        return None
+    match = pattern.match(str(value))
+    return match.group(1).lower() if match else None
+
+
+def normalize_tiktok_handle(url):
+    return _normalize_handle(_TIKTOK_HANDLE, url)
+
+
+def normalize_instagram_handle(url):
+    return _normalize_handle(_INSTAGRAM_HANDLE, url)
+
+
+def normalize_handles(values, platform):
+    # Batch form: one pattern lookup per call and one match per distinct
+    # value, since sheets repeat the same links across tabs.
+    pattern = _TIKTOK_HANDLE if platform == 'tiktok' else _INSTAGRAM_HANDLE
+    seen = {}
+    handles = []
+    for value in values:
+        if value not in seen:
+            seen[value] = _normalize_handle(pattern, value)
+        handles.append(seen[value])
+    return handles
+
+
+def creator_import_key(creator_type, tiktok_url=None, instagram_url=None, handle=None,
+                       phone=None, name=None, category=None):
+    prefix = creator_type.lower()
+    tiktok_handle = extract_tiktok_handle(tiktok_url)
+    if tiktok_handle:
+        return f"{prefix}:tiktok:{tiktok_handle.lstrip('@').lower()}"
+    instagram_handle = extract_instagram_handle(instagram_url)
+    if instagram_handle:
+        return f"{prefix}:instagram:{instagram_handle.lstrip('@').lower()}"
+    if handle and str(handle).strip().lstrip('@'):
+        return f"{prefix}:handle:{str(handle).strip().lstrip('@').lower()}"
+    digits = re.sub(r'\D', '', str(phone)) if phone else ''
+    if digits:
+        return f"{prefix}:phone:{digits}"
+    normalized_name = ' '.join(str(name or '').lower().split())
+    normalized_category = ' '.join(str(category or '').lower().split())
+    return f"{prefix}:name:{normalized_name}|{normalized_category}"
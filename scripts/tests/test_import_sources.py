@@ -0,0 +1,44 @@
+import openpyxl
+
+import import_creators as ic
+
+
+def _workbook(path):
+    wb = openpyxl.Workbook()
+    lifestyle = wb.active
+    lifestyle.title = 'Lifestyle'
+    lifestyle.append(['Influencer Name', 'Username on Tiktok', 'No. of followers', 'Industry', 'Phone number ',
+                      'Comments'])
+    lifestyle.append(['Zero', 'https://www.tiktok.com/@zero', 0, 0, 0, 0])
+    lifestyle.append(['Padded', 'https://www.tiktok.com/@padded', '12.5k', 'Fashion', '01012345678', 'ok'])
+    lifestyle.append(['Numbers', 'https://www.tiktok.com/@numbers', 1200, 'Food', 201012345678, 3.5])
+    ugc = wb.create_sheet('UGC')
+    ugc.append(['Name', 'Phone number', 'Handle', 'Mock video', 'Age', 'Gifted', 'Rating', 'Base rate'])
+    ugc.append(['Zero', 0, 0, 0, 0, 0, 0, 0])
+    ugc.append(['Set', '01098765432', '@set', True, 24, False, 4, '1500 EGP'])
+    wb.save(path)
+
+
+def _parse(wb):
+    return list(ic.parse_influencer_rows(wb)), list(ic.parse_ugc_rows(wb))
+
+
+def test_csv_export_parses_like_the_workbook(tmp_path):
+    path = str(tmp_path / 'creators.xlsx')
+    _workbook(path)
+    export_dir = str(tmp_path / 'csv')
+    ic.export_workbook_csv(path, export_dir, list(ic.INFLUENCER_SHEETS) + ['UGC'])
+
+    from_xlsx = _parse(ic.open_workbook(path, 'xlsx'))
+    from_csv = _parse(ic.open_workbook(export_dir, 'csv'))
+    assert from_csv == from_xlsx
+
+    influencers, ugc = from_csv
+    zero = influencers[0]
+    # 0 cells are empty in the workbook path, so they must not fill fields here.
+    assert zero[5] is None and zero[7] is None
+    assert influencers[1][5] == '01012345678'
+    # phone, handle, niche, has_mock_video, portfolio_url, age; gifted; rating, base_rate
+    assert ugc[0][1:7] == (None, None, None, False, None, None)
+    assert ugc[0][9] is False and ugc[0][14:16] == (None, None)
+    assert ugc[1][1] == '01098765432'
@@ -0,0 +1,65 @@
+import asyncio
+
+from tiktok_core import AdaptiveRateLimiter, ReplayApi, RetryPolicy, SessionPool, paginate_with_retries
+
+
+class CountingLimiter(AdaptiveRateLimiter):
+    def __init__(self) -> None:
+        super().__init__(0.0)
+        self.acquired = 0
+
+    async def acquire(self) -> None:
+        self.acquired += 1
+        await super().acquire()
+
+
+def _replay(items: int, page_size: int = 30) -> ReplayApi:
+    fixture = {"sources": {"search:q": [{"uniqueId": f"u{index}"} for index in range(items)]}, "infos": {}}
+    return ReplayApi(fixture, latency=0.0, page_size=page_size, seed=1)
+
+
+async def _collect(api: ReplayApi, limiter: CountingLimiter, count: int, page_size: int) -> list:
+    def pages(cursor: int, size: int, session_index: int):
+        return api.search.users("q", count=size, cursor=cursor, session_index=session_index)
+
+    items = paginate_with_retries(pages, count, SessionPool(2), limiter, RetryPolicy(0), "q", page_size=page_size)
+    return [item.username async for item in items]
+
+
+def test_limiter_is_acquired_for_every_page() -> None:
+    api = _replay(95)
+    limiter = CountingLimiter()
+    usernames = asyncio.run(_collect(api, limiter, 200, page_size=30))
+    assert usernames == [f"u{index}" for index in range(95)]
+    assert api.calls == 4
+    assert limiter.acquired >= api.calls
+    # One success per page, and the short last page ends the listing.
+    assert limiter.successes == 4
+    assert limiter.empty == 0
+
+
+def test_empty_listing_is_recorded_once() -> None:
+    api = _replay(0)
+    limiter = CountingLimiter()
+    assert asyncio.run(_collect(api, limiter, 50, page_size=10)) == []
+    assert limiter.acquired == 1
+    assert limiter.empty == 1
+
+
+def test_session_is_released_before_items_are_yielded() -> None:
+    api = _replay(45)
+    pool = SessionPool(1)
+
+    async def consume() -> list:
+        def pages(cursor: int, size: int, session_index: int):
+            return api.search.users("q", count=size, cursor=cursor, session_index=session_index)
+
+        in_flight = []
+        items = paginate_with_retries(pages, 45, pool, CountingLimiter(), RetryPolicy(0), "q", page_size=30)
+        async for _ in items:
+            in_flight.append(pool.health[0].in_flight)
+        return in_flight
+
+    assert asyncio.run(consume()) == [0] * 45
+    # One recorded request per page, not per pagination.
+    assert pool.health[0].requests == 2
@@ -0,0 +1,129 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+from tiktok_core import parse_list, synthesize_fixture
+
+# Runs the discovery scripts against a replayed fixture (tiktok_core.replay)
+# and reports throughput, peak memory and per-stage timings. No network or
+# ms_token is needed, so any scraper change can be measured before and after.
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+EG_SCRIPT = "tiktok_fetch_creators_eg.py"
+SEARCH_ALL_SCRIPT = "tiktok_fetch_search_creators_all.py"
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "eg-sequential": {"script": EG_SCRIPT, "args": ["--sessions", "1"]},
+    "eg-concurrent": {"script": EG_SCRIPT, "args": ["--sessions", "4", "--concurrent"]},
+    "search-all": {"script": SEARCH_ALL_SCRIPT, "args": ["--sessions", "1", "--no-checkpoint"]},
+    "search-all-concurrent": {
+        "script": SEARCH_ALL_SCRIPT,
+        "args": ["--sessions", "4", "--concurrent", "--no-checkpoint"],
+    },
+}
+
+
+def _command(name: str, args: argparse.Namespace, fixture: str, workdir: str, run: int) -> List[str]:
+    scenario = SCENARIOS[name]
+    prefix = os.path.join(workdir, f"{name}-{run}")
+    command = [
+        sys.executable,
+        os.path.join(SCRIPTS_DIR, scenario["script"]),
+        "--replay", fixture,
+        "--replay-latency", str(args.latency),
+        "--replay-error-rate", str(args.error_rate),
+        "--replay-seed", str(args.seed + run),
+        "--no-defaults",
+        "--queries", ",".join(args.queries),
+        "--search-count", str(args.per_source),
+        "--max-creators", "0",
+        "--info-sleep", "0",
+        "--backoff", "0.05",
+        "--bench-seconds", "1",
+        "--no-cache",
+        "--output", f"{prefix}.csv",
+        "--stats-output", f"{prefix}.json",
+    ]
+    if scenario["script"] == EG_SCRIPT:
+        command += ["--hashtags", ",".join(args.hashtags), "--hashtag-videos", str(args.per_source)]
+    return command + scenario["args"]
+
+
+def _run_once(command: List[str], log_path: str) -> Dict[str, Any]:
+    with open(log_path, "w", encoding="utf-8") as log:
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=log)
+        # wait4 reports the peak RSS of this child alone.
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise SystemExit(f"Benchmark run failed ({process.returncode}); see {log_path}")
+    stats_path = command[command.index("--stats-output") + 1]
+    with open(stats_path, "r", encoding="utf-8") as handle:
+        stats = json.load(handle)
+    # ru_maxrss is in KiB on Linux.
+    stats["peak_rss_mib"] = round(usage.ru_maxrss / 1024, 1)
+    return stats
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+    workdir = tempfile.mkdtemp(prefix="tiktok-bench-")
+    fixture = args.fixture
+    if not fixture:
+        fixture = os.path.join(workdir, "fixture.ndjson")
+        synthesize_fixture(fixture, args.queries, args.hashtags, args.per_source, args.creators, seed=args.seed)
+        sys.stderr.write(f"Synthesised fixture: {fixture}\n")
+
+    report: Dict[str, Any] = {"fixture": fixture, "latency": args.latency, "error_rate": args.error_rate}
+    for name in args.scenarios:
+        runs = []
+        for index in range(args.repeat):
+            command = _command(name, args, fixture, workdir, index)
+            runs.append(_run_once(command, os.path.join(workdir, f"{name}-{index}.log")))
+        # Report the median run by wall time.
+        median = sorted(runs, key=lambda stats: stats["seconds"])[len(runs) // 2]
+        median["seconds_all"] = [stats["seconds"] for stats in runs]
+        median["seconds_stdev"] = round(statistics.pstdev(median["seconds_all"]), 3)
+        report[name] = median
+
+    print(f"{'scenario':<24}{'creators':>9}{'sec':>8}{'creators/s':>12}{'items/s':>10}{'peak MiB':>10}  stages (s)")
+    for name in args.scenarios:
+        stats = report[name]
+        stages = " ".join(f"{stage}={value:.3f}" for stage, value in stats["timings"].items())
+        print(
+            f"{name:<24}{stats['creators']:>9}{stats['seconds']:>8.2f}{stats['creators_per_second']:>12.1f}"
+            f"{stats['items_per_second']:>10.1f}{stats['peak_rss_mib']:>10.1f}  {stages}"
+        )
+    if args.json_output:
+        with open(args.json_output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, ensure_ascii=False, indent=2)
+        sys.stderr.write(f"Wrote JSON: {args.json_output}\n")
+    sys.stderr.write(f"Logs and outputs kept in {workdir}\n")
+    return report
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the TikTok discovery scripts offline")
+    parser.add_argument("--fixture", type=str, default="", help="Replay fixture (default: synthesise one)")
+    parser.add_argument("--scenarios", type=parse_list, default=list(SCENARIOS))
+    parser.add_argument("--queries", type=parse_list, default=["egypt", "cairo", "مصر"])
+    parser.add_argument("--hashtags", type=parse_list, default=["egypt", "cairo", "مصر", "alexandria"])
+    parser.add_argument("--per-source", type=int, default=500, help="Results per search/hashtag")
+    parser.add_argument("--creators", type=int, default=5000, help="Distinct creators in a synthesised fixture")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds per replayed request")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json-output", type=str, default="")
+    return parser
+
+
+if __name__ == "__main__":
+    run(build_parser().parse_args())
@@ -0,0 +1,131 @@
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator
+
+from tiktok_core import CreatorRecord, SourceLabels, profile_url
+
+# Compares the memory of holding discovered creators as CreatorRecord slots
+# against the per-creator dicts (plus a side set of source labels) the
+# discovery scripts used before. Payloads are synthesised the way json.loads
+# hands them over: fresh strings for every creator, regions included.
+
+REGIONS = ["EG", "SA", "AE", "US", "", "", ""]
+
+
+def _payloads(creators: int, sources: int, per_creator: int, seed: int) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    labels = [f"hashtag:tag{index}" for index in range(sources)]
+    for index in range(creators):
+        yield {
+            "username": f"creator_{index}",
+            "name": f"Creator {index}",
+            "signature": "Content creator from cairo " * rng.randint(0, 3),
+            "region": "".join(rng.choice(REGIONS)),
+            "followers": rng.randint(0, 2_000_000) if rng.random() < 0.7 else None,
+            "video_count": rng.randint(0, 900) if rng.random() < 0.5 else None,
+            "sec_uid": f"MS4wLjABAAAA{index:032d}",
+            "user_id": str(7_000_000_000_000_000_000 + index),
+            "sources": [
+                "".join(label) for label in rng.sample(labels, min(per_creator, len(labels)))
+            ],
+        }
+
+
+def _load_dicts(payloads: Iterator[Dict[str, Any]]) -> Any:
+    creators: Dict[str, Dict[str, Any]] = {}
+    for payload in payloads:
+        username = payload["username"]
+        creators[username] = {
+            "name": payload["name"],
+            "username": username,
+            "profile_url": profile_url(username),
+            "followers": payload["followers"],
+            "signature": payload["signature"],
+            "region": payload["region"],
+            "video_count": payload["video_count"],
+            "sec_uid": payload["sec_uid"],
+            "user_id": payload["user_id"],
+            "location_hint": "",
+            "location_source": "region" if payload["region"] else "",
+            "sources": set(payload["sources"]),
+        }
+    return creators
+
+
+def _load_records(payloads: Iterator[Dict[str, Any]]) -> Any:
+    creators: Dict[str, CreatorRecord] = {}
+    labels = SourceLabels()
+    for payload in payloads:
+        username = payload["username"]
+        creators[username] = CreatorRecord(
+            username,
+            name=payload["name"],
+            signature=payload["signature"],
+            region=payload["region"],
+            followers=payload["followers"],
+            video_count=payload["video_count"],
+            sec_uid=payload["sec_uid"],
+            user_id=payload["user_id"],
+            location_source="region" if payload["region"] else "",
+            sources=labels.mask(payload["sources"]),
+        )
+    return creators, labels
+
+
+def _measure(load: Callable[[Iterator[Dict[str, Any]]], Any], args: argparse.Namespace) -> Dict[str, Any]:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    held = load(_payloads(args.creators, args.sources, args.per_creator, args.seed))
+    seconds = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return {
+        "bytes": current,
+        "peak_bytes": peak,
+        "bytes_per_creator": round(current / max(args.creators, 1), 1),
+        "seconds": round(seconds, 3),
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Any] = {
+        "creators": args.creators,
+        "sources": args.sources,
+        "per_creator": args.per_creator,
+        "dict": _measure(_load_dicts, args),
+        "record": _measure(_load_records, args),
+    }
+    results["saving"] = round(1 - results["record"]["bytes"] / max(results["dict"]["bytes"], 1), 3)
+    for name in ("dict", "record"):
+        stats = results[name]
+        sys.stderr.write(
+            f"{name:>6}: {stats['bytes'] / 2**20:8.1f} MiB held, {stats['bytes_per_creator']:7.1f} B/creator, "
+            f"peak {stats['peak_bytes'] / 2**20:8.1f} MiB, {stats['seconds']}s\n"
+        )
+    sys.stderr.write(f"CreatorRecord saves {results['saving']:.0%} of the dict layout.\n")
+    if args.json_output:
+        with open(args.json_output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+        sys.stderr.write(f"Wrote JSON: {args.json_output}\n")
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Measure creator registry memory: dicts vs CreatorRecord")
+    parser.add_argument("--creators", type=int, default=200_000)
+    parser.add_argument("--sources", type=int, default=50, help="Distinct source labels")
+    parser.add_argument("--per-creator", type=int, default=2, help="Source labels per creator")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json-output", type=str, default="")
+    return parser
+
+
+if __name__ == "__main__":
+    run(build_parser().parse_args())
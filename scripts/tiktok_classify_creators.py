@@ -0,0 +1,231 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from tiktok_core import (
+    EGYPT_KEYWORDS,
+    EGYPT_KEYWORDS_AR,
+    KeywordMatcher,
+    is_egypt_candidate,
+    json_default,
+    parse_list,
+    profile_url,
+    region_is_egypt,
+    user_fields,
+)
+
+# Re-runs the Egypt filter of tiktok_fetch_creators_eg.py over archived crawls
+# (raw user-info / search / hashtag-video payloads, discovery NDJSON streams or
+# CSV exports) without talking to TikTok.
+
+_MATCHER: Optional[KeywordMatcher] = None
+_ROW_FIELDS = ("name", "username", "signature", "region", "followers")
+
+
+def iter_payloads(path: str) -> Iterator[Union[str, Dict[str, Any]]]:
+    # NDJSON lines are yielded undecoded so worker processes do the parsing.
+    if path.lower().endswith(".csv"):
+        with open(path, "r", encoding="utf-8-sig", newline="") as handle:
+            yield from csv.DictReader(handle)
+        return
+    with open(path, "r", encoding="utf-8") as handle:
+        head = handle.read(1)
+        while head and head.isspace():
+            head = handle.read(1)
+        if head == "[":
+            # A JSON array (the --json-output of the discovery scripts).
+            handle.seek(0)
+            yield from json.load(handle)
+            return
+        handle.seek(0)
+        for line in handle:
+            if line.strip():
+                yield line
+
+
+def _init_worker(keywords: List[str]) -> None:
+    global _MATCHER
+    _MATCHER = KeywordMatcher(keywords)
+
+
+def classify_batch(
+    payloads: List[Union[str, Dict[str, Any]]], require_region: bool
+) -> Tuple[List[Tuple[bool, str]], Dict[str, Any]]:
+    # Returns (kept, NDJSON line) pairs plus this batch's counters.
+    matcher = _MATCHER
+    decisions: List[Tuple[bool, str]] = []
+    counts: Counter = Counter()
+    keyword_hits: Counter = Counter()
+    for payload in payloads:
+        if isinstance(payload, str):
+            try:
+                payload = json.loads(payload)
+            except json.JSONDecodeError:
+                counts["invalid"] += 1
+                continue
+        if "dropped" in payload:
+            # Rename markers from a discovery --stream-output file.
+            continue
+        fields = user_fields(payload)
+        row = {key: fields[key] for key in _ROW_FIELDS}
+        if not row["username"]:
+            counts["invalid"] += 1
+            continue
+        text = " ".join(value for value in (row["username"], row["name"], row["signature"]) if value)
+        hits = matcher.find_all(text)
+        keyword_hits.update(hits)
+        if require_region and not region_is_egypt(row["region"]):
+            kept = False
+            counts["filtered_region"] += 1
+        else:
+            kept = is_egypt_candidate(text, row["region"], "", False, matcher)
+            counts["kept" if kept else "filtered_keywords"] += 1
+            if kept and region_is_egypt(row["region"]):
+                counts["kept_by_region"] += 1
+        row["location_hint"] = hits[0] if hits else ""
+        row["location_hits"] = hits
+        row["profile_url"] = profile_url(row["username"])
+        decisions.append((kept, json.dumps(row, ensure_ascii=False, default=json_default)))
+    return decisions, {"counts": counts, "keyword_hits": keyword_hits}
+
+
+def _batches(payloads: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(payloads)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _classify_parallel(
+    batches: Iterator[List[Any]], keywords: List[str], require_region: bool, workers: int
+) -> Iterator[Tuple[List[Tuple[bool, str]], Dict[str, Any]]]:
+    # Keep only a few batches in flight so a huge dump is never fully in memory;
+    # results come back in input order.
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(keywords,)
+    ) as pool:
+        pending: Deque[Future] = deque()
+        for batch in batches:
+            pending.append(pool.submit(classify_batch, batch, require_region))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _open_output(path: str) -> Optional[TextIO]:
+    if not path:
+        return None
+    if path in {"-", "stdout"}:
+        return sys.stdout
+    output_dir = os.path.dirname(path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    return open(path, "w", encoding="utf-8")
+
+
+def _load_keywords(args: argparse.Namespace) -> List[str]:
+    keywords = args.keywords or EGYPT_KEYWORDS + EGYPT_KEYWORDS_AR
+    if args.keywords_file:
+        with open(args.keywords_file, "r", encoding="utf-8") as handle:
+            keywords = [line.strip() for line in handle if line.strip() and not line.startswith("#")]
+    return keywords + args.extra_keywords
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    keywords = _load_keywords(args)
+    if not keywords:
+        raise SystemExit("No keywords to classify with.")
+    started = time.perf_counter()
+    batches = (
+        batch
+        for path in args.inputs
+        for batch in _batches(iter_payloads(path), args.batch_size)
+    )
+    if args.workers > 1:
+        results = _classify_parallel(batches, keywords, args.require_region, args.workers)
+    else:
+        _init_worker(keywords)
+        results = (classify_batch(batch, args.require_region) for batch in batches)
+
+    kept_handle = _open_output(args.output)
+    rejected_handle = _open_output(args.rejected_output)
+    counts: Counter = Counter()
+    keyword_hits: Counter = Counter()
+    try:
+        for decisions, batch_stats in results:
+            counts.update(batch_stats["counts"])
+            keyword_hits.update(batch_stats["keyword_hits"])
+            for kept, line in decisions:
+                handle = kept_handle if kept else rejected_handle
+                if handle:
+                    handle.write(line + "\n")
+    finally:
+        for handle in (kept_handle, rejected_handle):
+            if handle and handle is not sys.stdout:
+                handle.close()
+
+    filtered = counts["filtered_region"] + counts["filtered_keywords"]
+    stats = {
+        "records": counts["kept"] + filtered + counts["invalid"],
+        "kept": counts["kept"],
+        "kept_by_region": counts["kept_by_region"],
+        "filtered_out": filtered,
+        "filtered_region": counts["filtered_region"],
+        "filtered_keywords": counts["filtered_keywords"],
+        "invalid": counts["invalid"],
+        "keyword_hits": dict(keyword_hits.most_common()),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    sys.stderr.write(
+        f"Classification summary: records={stats['records']}, kept={stats['kept']}, "
+        f"filtered_out={stats['filtered_out']}, invalid={stats['invalid']} "
+        f"in {stats['seconds']}s\n"
+    )
+    if args.stats_output:
+        with open(args.stats_output, "w", encoding="utf-8") as handle:
+            json.dump(stats, handle, ensure_ascii=False, indent=2)
+        sys.stderr.write(f"Wrote stats: {args.stats_output}\n")
+    else:
+        sys.stderr.write(json.dumps(stats, ensure_ascii=False) + "\n")
+    return stats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Classify archived TikTok creator dumps (JSON/NDJSON/CSV) with the Egypt filter"
+    )
+    parser.add_argument("inputs", nargs="+", help="JSON array, NDJSON or CSV files")
+    parser.add_argument("--output", type=str, default="", help="NDJSON of kept creators ('-' = stdout)")
+    parser.add_argument("--rejected-output", type=str, default="", help="NDJSON of filtered creators")
+    parser.add_argument("--stats-output", type=str, default="")
+    parser.add_argument(
+        "--keywords",
+        type=parse_list,
+        default=[],
+        help="Comma-separated keywords replacing the built-in Egypt list",
+    )
+    parser.add_argument("--keywords-file", type=str, default="", help="One keyword per line")
+    parser.add_argument("--extra-keywords", type=parse_list, default=[])
+    parser.add_argument("--require-region", action="store_true")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Classify in this many worker processes (1 = serial)",
+    )
+    parser.add_argument("--batch-size", type=int, default=5000)
+    return parser
+
+
+if __name__ == "__main__":
+    run(build_parser().parse_args())
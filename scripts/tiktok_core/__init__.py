@@ -0,0 +1,114 @@
+from .batch import run_batch, run_section, run_workers
+from .checkpoint import Checkpoint
+from .downloads import DownloadError, VideoStore, add_download_arguments, download_video, download_videos
+from .dumps import (
+    FIELD_PRESETS,
+    SUFFIXES,
+    Projection,
+    add_dump_arguments,
+    check_compression,
+    open_dump,
+    write_ndjson,
+)
+from .egypt_filter import (
+    EGYPT_KEYWORDS,
+    EGYPT_KEYWORDS_AR,
+    EGYPT_MATCHER,
+    KeywordMatcher,
+    find_location_hint,
+    is_egypt_candidate,
+    normalize_text,
+    region_is_egypt,
+)
+from .metrics import Histogram, Metrics, MetricsReporter, add_metrics_arguments, open_reporter, prometheus_text
+from .payloads import extract_int, profile_url, user_fields
+from .pipeline import (
+    CreatorPipeline,
+    HashtagVideosSource,
+    SearchUsersSource,
+    add_pipeline_arguments,
+    parse_list,
+)
+from .rate_limit import AdaptiveRateLimiter, RetryPolicy, call_with_retries, paginate_with_retries
+from .records import CreatorRecord, SourceLabels
+from .replay import ReplayApi, Recorder, load_fixture, synthesize_fixture
+from .session_pool import (
+    SessionPool,
+    add_browser_arguments,
+    add_session_arguments,
+    load_ms_tokens,
+    load_proxies,
+    open_api,
+    open_pool,
+    session_count,
+    start_sessions,
+)
+from .stream import CreatorStream, compact, finalize_results, json_default, write_outputs
+from .user_cache import UserInfoCache, open_cache
+
+__all__ = [
+    "AdaptiveRateLimiter",
+    "Checkpoint",
+    "CreatorPipeline",
+    "CreatorRecord",
+    "CreatorStream",
+    "DownloadError",
+    "EGYPT_KEYWORDS",
+    "EGYPT_KEYWORDS_AR",
+    "EGYPT_MATCHER",
+    "FIELD_PRESETS",
+    "HashtagVideosSource",
+    "Histogram",
+    "Metrics",
+    "MetricsReporter",
+    "KeywordMatcher",
+    "Projection",
+    "Recorder",
+    "ReplayApi",
+    "RetryPolicy",
+    "SUFFIXES",
+    "SearchUsersSource",
+    "SessionPool",
+    "SourceLabels",
+    "UserInfoCache",
+    "VideoStore",
+    "add_browser_arguments",
+    "add_download_arguments",
+    "add_dump_arguments",
+    "add_metrics_arguments",
+    "add_pipeline_arguments",
+    "add_session_arguments",
+    "call_with_retries",
+    "check_compression",
+    "compact",
+    "download_video",
+    "download_videos",
+    "extract_int",
+    "finalize_results",
+    "find_location_hint",
+    "is_egypt_candidate",
+    "json_default",
+    "load_fixture",
+    "load_ms_tokens",
+    "load_proxies",
+    "normalize_text",
+    "open_api",
+    "open_cache",
+    "open_dump",
+    "open_pool",
+    "open_reporter",
+    "paginate_with_retries",
+    "parse_list",
+    "profile_url",
+    "prometheus_text",
+    "region_is_egypt",
+    "run_batch",
+    "run_section",
+    "run_workers",
+    "session_count",
+    "start_sessions",
+    "synthesize_fixture",
+    "user_fields",
+    "write_ndjson",
+    "write_outputs",
+]
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import sys
+import time
+import traceback
+from typing import Any, Awaitable, Callable, Dict, List, TextIO
+
+from .session_pool import SessionPool
+
+
+async def run_workers(queue: asyncio.Queue, handle: Callable[[Any], Awaitable[None]], workers: int) -> None:
+    # Drains queue with `workers` tasks calling handle(item); a slow item only
+    # holds up its own worker. handle is expected to report its own failures.
+    async def worker() -> None:
+        while True:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await handle(item)
+
+    await asyncio.gather(*(worker() for _ in range(max(workers, 1))))
+
+
+async def run_section(
+    pool: SessionPool,
+    timings: Dict[str, float],
+    name: str,
+    target: Dict[str, Any],
+    prefix: str,
+    fetch: Callable[[int], Awaitable[None]],
+) -> bool:
+    # Runs one fetch on a pooled session and times it; a failure lands in
+    # target as <prefix>_error/<prefix>_trace so the caller's other sections
+    # carry on.
+    started = time.perf_counter()
+    try:
+        async with pool.session() as session_index:
+            await fetch(session_index)
+        return True
+    except Exception as exc:  # noqa: BLE001 - reported in the output
+        target[f"{prefix}_error"] = str(exc)
+        target[f"{prefix}_trace"] = traceback.format_exc()
+        sys.stderr.write(f"{name} failed: {exc}\n")
+        return False
+    finally:
+        timings[name] = round(time.perf_counter() - started, 3)
+
+
+async def run_batch(
+    keys: List[str],
+    fetch: Callable[[str], Awaitable[Dict[str, Any]]],
+    output: TextIO,
+    workers: int,
+    describe: Callable[[Dict[str, Any]], str],
+) -> int:
+    # Builds one record per key, `workers` at a time, and writes each as an
+    # NDJSON line as soon as it completes, so a long batch can be tailed or
+    # cut short without losing finished records. describe(record) is the
+    # progress note logged per key.
+    queue: asyncio.Queue = asyncio.Queue()
+    for key in keys:
+        queue.put_nowait(key)
+    done = 0
+
+    async def handle(key: str) -> None:
+        nonlocal done
+        record = await fetch(key)
+        output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        output.flush()
+        done += 1
+        sys.stderr.write(f"[{done}/{len(keys)}] {key}: {describe(record)}\n")
+
+    await run_workers(queue, handle, workers)
+    return done
@@ -0,0 +1,37 @@
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from .stream import json_default
+
+
+class Checkpoint:
+    def __init__(self, path: str, interval: float = 60.0) -> None:
+        self.path = path
+        self.interval = interval
+        self._last_saved = time.monotonic()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def due(self) -> bool:
+        return self.interval > 0 and time.monotonic() - self._last_saved >= self.interval
+
+    def save(self, state: Dict[str, Any]) -> None:
+        # Write-then-rename so a crash mid-save never leaves a truncated checkpoint.
+        checkpoint_dir = os.path.dirname(self.path)
+        if checkpoint_dir:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(state, handle, ensure_ascii=False, default=json_default)
+        os.replace(tmp_path, self.path)
+        self._last_saved = time.monotonic()
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
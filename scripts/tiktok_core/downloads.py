@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import httpx
+
+DEFAULT_VIDEO_DIR = "data/tiktok_videos"
+# TikTok's CDN answers with video/mp4; a block or captcha page comes back as
+# text/html (sometimes with a 200), so the content type is checked as well.
+VIDEO_CONTENT_TYPES = ("video/", "application/octet-stream")
+
+
+class DownloadError(Exception):
+    pass
+
+
+# Content-addressed video store: every file is named by the sha256 of its
+# bytes (<dir>/ab/abcdef....mp4), so the same video fetched twice, or under
+# two ids, is kept once. Bytes are streamed straight to disk in chunks, never
+# held in memory or in the JSON output.
+class VideoStore:
+    def __init__(self, directory: str = DEFAULT_VIDEO_DIR, extension: str = ".mp4") -> None:
+        self.directory = directory
+        self.extension = extension
+        self.downloaded = 0
+        self.deduplicated = 0
+        self.bytes_written = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], f"{digest}{self.extension}")
+
+    async def save(self, chunks: Any) -> Dict[str, Any]:
+        # chunks is an async iterator of bytes, e.g. a response's aiter_bytes().
+        # Disk work runs in a thread so a slow disk never stalls the event loop.
+        digest = hashlib.sha256()
+        size = 0
+        handle, tmp_path = await asyncio.to_thread(tempfile.mkstemp, dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(handle, "wb") as output:
+                async for chunk in chunks:
+                    digest.update(chunk)
+                    await asyncio.to_thread(output.write, chunk)
+                    size += len(chunk)
+            sha256 = digest.hexdigest()
+            path = self.path_for(sha256)
+            deduplicated = await asyncio.to_thread(self._commit, tmp_path, path)
+            if deduplicated:
+                self.deduplicated += 1
+            else:
+                self.bytes_written += size
+            self.downloaded += 1
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return {"path": path, "size": size, "sha256": sha256, "deduplicated": deduplicated}
+
+    @staticmethod
+    def _commit(tmp_path: str, path: str) -> bool:
+        # Moves a finished download into place; True if it was already stored.
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            return True
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+        return False
+
+    def summary(self) -> str:
+        return (
+            f"Video store {self.directory}: downloaded={self.downloaded}, "
+            f"deduplicated={self.deduplicated}, written={self.bytes_written / 2**20:.1f} MiB"
+        )
+
+
+def _video_id(video: Any) -> Any:
+    return getattr(video, "id", None) or (getattr(video, "as_dict", None) or {}).get("id")
+
+
+def _check_response(response: Any) -> None:
+    if response.status_code not in (200, 206):
+        raise DownloadError(f"HTTP {response.status_code}")
+    content_type = response.headers.get("content-type", "")
+    if not content_type.startswith(VIDEO_CONTENT_TYPES):
+        raise DownloadError(f"unexpected content type {content_type or 'none'!r}")
+
+
+async def _download_request(video: Any, session_index: Optional[int]) -> Tuple[str, Dict[str, str], Any]:
+    # The request Video.bytes(stream=True) would send: url, headers and cookies
+    # of the video's TikTokApi session. TikTokApi has no public way to get at
+    # the session, so this is the one place that relies on its private
+    # _get_session.
+    api = getattr(video, "parent", None)
+    if not hasattr(api, "_get_session") or not hasattr(api, "get_session_cookies"):
+        raise DownloadError(
+            "video is not attached to a TikTokApi instance with _get_session/get_session_cookies "
+            "(unsupported TikTokApi version?)"
+        )
+    video_data = video.as_dict.get("video", {})
+    url = video_data.get("downloadAddr") or video_data.get("playAddr")
+    if not url:
+        raise DownloadError("no download address")
+    kwargs = {} if session_index is None else {"session_index": session_index}
+    _, session = api._get_session(**kwargs)
+    cookies = await api.get_session_cookies(session)
+    headers = dict(session.headers or {})
+    headers.update(
+        {"range": "bytes=0-", "accept-encoding": "identity;q=1, *;q=0", "referer": "https://www.tiktok.com/"}
+    )
+    return url, headers, cookies
+
+
+async def download_video(
+    video: Any,
+    store: VideoStore,
+    session_index: Optional[int] = None,
+    client: Optional["httpx.AsyncClient"] = None,
+) -> Dict[str, Any]:
+    # Video.bytes(stream=True) hides the response; fetching it here lets the
+    # status and content type be checked before anything is stored.
+    if client is None:
+        # Imported here so the offline tools in this package run without httpx.
+        import httpx
+
+        async with httpx.AsyncClient() as client:
+            return await download_video(video, store, session_index, client)
+    url, headers, cookies = await _download_request(video, session_index)
+    async with client.stream("GET", url, headers=headers, cookies=cookies) as response:
+        _check_response(response)
+        result = await store.save(response.aiter_bytes())
+    result["id"] = _video_id(video)
+    return result
+
+
+async def download_videos(
+    videos: List[Any], store: VideoStore, pool: Any, concurrency: int = 4
+) -> List[Dict[str, Any]]:
+    # At most `concurrency` downloads in flight, each on a pooled session; a
+    # failed download is reported in its entry instead of stopping the rest.
+    import httpx
+
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def fetch(client: "httpx.AsyncClient", video: Any) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                async with pool.session() as session_index:
+                    return await download_video(video, store, session_index, client)
+            except Exception as exc:  # noqa: BLE001
+                sys.stderr.write(f"Download failed for video {_video_id(video)}: {exc}\n")
+                return {"id": _video_id(video), "error": str(exc)}
+
+    async with httpx.AsyncClient() as client:
+        return await asyncio.gather(*(fetch(client, video) for video in videos))
+
+
+def add_download_arguments(parser: Any) -> None:
+    parser.add_argument(
+        "--video-dir",
+        type=str,
+        default=DEFAULT_VIDEO_DIR,
+        help="Directory for downloaded videos, stored by sha256 of their content",
+    )
+    parser.add_argument("--download-concurrency", type=int, default=4, help="Videos downloaded at once")
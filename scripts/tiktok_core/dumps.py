@@ -0,0 +1,145 @@
+import gzip
+import io
+import json
+import os
+from typing import Any, Dict, Iterable, Optional, TextIO
+
+from .stream import json_default
+
+SUFFIXES = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+
+# Fields worth archiving from the payloads tiktok_fetch_all.py collects
+# (videos, comments, playlists, search users). Paths missing from an item
+# are skipped, so one list serves every section.
+FIELD_PRESETS = {
+    "compact": [
+        "id",
+        "desc",
+        "createTime",
+        "author.id",
+        "author.uniqueId",
+        "author.nickname",
+        "authorStats",
+        "stats",
+        "statsV2",
+        "music.id",
+        "music.title",
+        "challenges.title",
+        "video.duration",
+        "cid",
+        "text",
+        "create_time",
+        "digg_count",
+        "user.unique_id",
+        "user.uniqueId",
+        "user.id",
+        "user.nickname",
+        "user.signature",
+        "user.region",
+        "name",
+        "title",
+        "videoCount",
+    ],
+}
+
+
+# Keeps only the listed dotted paths of a payload ("author.uniqueId" keeps
+# {"author": {"uniqueId": ...}}); lists along a path are projected item by
+# item. The paths are compiled once into a tree, not re-split per item.
+class Projection:
+    def __init__(self, spec: str = "") -> None:
+        paths = FIELD_PRESETS.get(spec) or [path.strip() for path in spec.split(",") if path.strip()]
+        self.tree: Optional[Dict[str, Any]] = None
+        for path in paths:
+            node = self.tree = self.tree if self.tree is not None else {}
+            parts = path.split(".")
+            for part in parts[:-1]:
+                child = node.get(part, {})
+                if child is None:
+                    break
+                node = node.setdefault(part, child)
+            else:
+                node[parts[-1]] = None
+
+    def __call__(self, payload: Any) -> Any:
+        if self.tree is None:
+            return payload
+        return _project(payload, self.tree)
+
+
+def _project(value: Any, tree: Optional[Dict[str, Any]]) -> Any:
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_project(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: _project(value[key], subtree) for key, subtree in tree.items() if key in value}
+
+
+def compression_for(path: str, compression: str = "auto") -> str:
+    if compression != "auto":
+        return compression
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        return "zstd"
+    return "none"
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError:
+        raise SystemExit("zstd output requires zstandard (pip install zstandard)")
+    return zstandard
+
+
+def check_compression(compression: str, path: str = "") -> None:
+    # Fail before a long crawl rather than when its output is written.
+    if compression_for(path, compression) == "zstd":
+        _zstandard()
+
+
+def open_dump(path: str, compression: str = "auto") -> TextIO:
+    # Text handle for path, compressed per `compression` (auto = by suffix).
+    compression = compression_for(path, compression)
+    output_dir = os.path.dirname(path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+    if compression == "zstd":
+        writer = _zstandard().ZstdCompressor(level=10).stream_writer(open(path, "wb"))
+        return io.TextIOWrapper(writer, encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+def write_ndjson(path: str, items: Iterable[Any], compression: str = "auto") -> int:
+    count = 0
+    with open_dump(path, compression) as handle:
+        for item in items:
+            handle.write(json.dumps(item, ensure_ascii=False, default=json_default) + "\n")
+            count += 1
+    return count
+
+
+def add_dump_arguments(parser: Any) -> None:
+    parser.add_argument(
+        "--fields",
+        type=str,
+        default="",
+        help=f"Keep only these dotted paths of each item, or a preset ({', '.join(FIELD_PRESETS)})",
+    )
+    parser.add_argument(
+        "--dump-dir",
+        type=str,
+        default="",
+        help="Write one NDJSON file per section plus summary.json here instead of one pretty JSON",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=["auto", "gzip", "zstd", "none"],
+        default="auto",
+        help="Compression for --dump-dir (auto = gzip) and --batch-output (auto = by suffix)",
+    )
@@ -0,0 +1,169 @@
+import re
+from typing import Dict, Iterable, List, Optional, Pattern
+
+EGYPT_KEYWORDS = [
+    "egypt",
+    "egyptian",
+    "cairo",
+    "alexandria",
+    "giza",
+    "zagazig",
+    "mansoura",
+    "tanta",
+    "aswan",
+    "luxor",
+    "sohag",
+    "ismailia",
+    "port said",
+    "portsaid",
+    "suez",
+    "fayoum",
+    "sharm",
+    "sharm el sheikh",
+    "hurghada",
+    "dahab",
+    "minya",
+    "beni suef",
+    "banha",
+    "damietta",
+    "mallawi",
+    "el mahalla",
+    "kafr",
+    "matrouh",
+    "qena",
+    "asyut",
+]
+
+EGYPT_KEYWORDS_AR = [
+    "مصر",
+    "مصري",
+    "مصرية",
+    "القاهرة",
+    "الجيزة",
+    "جيزة",
+    "الإسكندرية",
+    "اسكندرية",
+    "سوهاج",
+    "أسوان",
+    "اسوان",
+    "الأقصر",
+    "الاقصر",
+    "الغردقة",
+    "شرم",
+    "الفيوم",
+    "الإسماعيلية",
+    "الاسماعيلية",
+    "بورسعيد",
+    "دمياط",
+    "المنيا",
+    "بنها",
+    "أسيوط",
+    "اسيوط",
+    "قنا",
+    "مطروح",
+]
+
+EGYPT_REGION_CODES = {"eg", "egy", "egypt"}
+
+# Hamza/madda alef variants fold to bare alef; tatweel and harakat are dropped
+# so "الإسكندرية", "الاسكندرية" and "الإسْكَنْدَرِيَّة" all match alike.
+_ARABIC_FOLD = {ord(char): "ا" for char in "أإآٱ"}
+_ARABIC_FOLD[ord("ـ")] = None
+_ARABIC_FOLD.update({code: None for code in range(0x064B, 0x0653)})
+_FOLDABLE = re.compile("[أإآٱـ\u064b-\u0652]")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    lowered = (text or "").lower()
+    # translate() is slow next to the regex scan; most text has nothing to fold.
+    if _FOLDABLE.search(lowered):
+        return lowered.translate(_ARABIC_FOLD)
+    return lowered
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    # Factor the keywords into a prefix tree ("egypt(?:ian)?") so the regex
+    # engine branches on one character instead of retrying every keyword.
+    trie: Dict[str, Dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" not in node:
+            return body
+        # Greedy optional: the longest keyword wins at each position.
+        return f"(?:{body})?" if len(branches) == 1 else f"{body}?"
+
+    return build(trie)
+
+
+# Matches every keyword in one regex pass over the normalised text.
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords: List[str] = []
+        canonical: Dict[str, str] = {}
+        for keyword in keywords:
+            folded = normalize_text(keyword)
+            if folded and folded not in canonical:
+                canonical[folded] = keyword
+                self.keywords.append(keyword)
+        self._rank = {keyword: rank for rank, keyword in enumerate(self.keywords)}
+        pattern = _trie_pattern(canonical)
+        self._any: Pattern[str] = re.compile(pattern)
+        # The lookahead yields the longest keyword starting at each position;
+        # every keyword contained in it is implied, so overlapping hits
+        # ("egypt" inside "egyptian") are not lost.
+        self._every: Pattern[str] = re.compile(f"(?=({pattern}))")
+        self._implied: Dict[str, List[str]] = {
+            folded: [canonical[other] for other in canonical if other in folded]
+            for folded in canonical
+        }
+
+    def search(self, text: Optional[str]) -> bool:
+        return self._any.search(normalize_text(text)) is not None
+
+    def find_all(self, text: Optional[str]) -> List[str]:
+        # Matched keywords in list order, reported under each keyword's first spelling.
+        normalized = normalize_text(text)
+        if self._any.search(normalized) is None:
+            return []
+        hits = set()
+        for found in set(self._every.findall(normalized)):
+            hits.update(self._implied[found])
+        return sorted(hits, key=self._rank.__getitem__)
+
+    def first(self, text: Optional[str]) -> str:
+        hits = self.find_all(text)
+        return hits[0] if hits else ""
+
+
+EGYPT_MATCHER = KeywordMatcher(EGYPT_KEYWORDS + EGYPT_KEYWORDS_AR)
+
+
+def region_is_egypt(region: Optional[str]) -> bool:
+    return (region or "").lower() in EGYPT_REGION_CODES
+
+
+def find_location_hint(text: str, matcher: KeywordMatcher = EGYPT_MATCHER) -> str:
+    return matcher.first(text)
+
+
+def is_egypt_candidate(
+    text: str,
+    region: str,
+    source_hint: str,
+    allow_source: bool,
+    matcher: KeywordMatcher = EGYPT_MATCHER,
+) -> bool:
+    if region_is_egypt(region):
+        return True
+    if allow_source and source_hint:
+        return True
+    return matcher.search(text)
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO, Tuple
+
+# Seconds; TikTok calls range from ~100 ms pages to multi-second captcha stalls.
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        # Upper bound of the bucket holding the q-th observation, capped at the max seen.
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return round(min(self.buckets[index], self.max) if index < len(self.buckets) else self.max, 4)
+        return round(self.max, 4)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 4),
+            "mean": round(self.sum / self.count, 4) if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": round(self.max, 4),
+            "buckets": dict(zip([str(bound) for bound in self.buckets] + ["+Inf"], self.counts)),
+        }
+
+
+# In-process registry: latency histograms per stage, labelled counters, and
+# gauges read from callables when a snapshot is taken.
+class Metrics:
+    def __init__(self) -> None:
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self.gauges: Dict[str, Callable[[], Any]] = {}
+        self.started = time.monotonic()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = Histogram()
+        histogram.observe(seconds)
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def gauge(self, name: str, read: Callable[[], Any]) -> None:
+        self.gauges[name] = read
+
+    def snapshot(self) -> Dict[str, Any]:
+        counters: Dict[str, List[Dict[str, Any]]] = {}
+        for (name, labels), value in sorted(self.counters.items()):
+            counters.setdefault(name, []).append({"labels": dict(labels), "value": value})
+        return {
+            "ts": round(time.time(), 3),
+            "elapsed": round(time.monotonic() - self.started, 3),
+            "stages": {stage: histogram.snapshot() for stage, histogram in sorted(self.histograms.items())},
+            "counters": counters,
+            "gauges": {name: read() for name, read in self.gauges.items()},
+        }
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def prometheus_text(snapshot: Dict[str, Any], prefix: str = "tiktok") -> str:
+    lines: List[str] = []
+    if snapshot["stages"]:
+        lines.append(f"# TYPE {prefix}_stage_seconds histogram")
+    for stage, histogram in snapshot["stages"].items():
+        cumulative = 0
+        for bound, count in histogram["buckets"].items():
+            cumulative += count
+            lines.append(f"{prefix}_stage_seconds_bucket{_labels({'stage': stage, 'le': bound})} {cumulative}")
+        lines.append(f"{prefix}_stage_seconds_sum{_labels({'stage': stage})} {histogram['sum']}")
+        lines.append(f"{prefix}_stage_seconds_count{_labels({'stage': stage})} {histogram['count']}")
+    for name, series in snapshot["counters"].items():
+        lines.append(f"# TYPE {prefix}_{name} counter")
+        for point in series:
+            lines.append(f"{prefix}_{name}{_labels(point['labels'])} {point['value']}")
+    for name, value in snapshot["gauges"].items():
+        if isinstance(value, dict):
+            # {label value: number}, e.g. queue depths keyed by queue name.
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            for label, number in value.items():
+                lines.append(f"{prefix}_{name}{_labels({'name': label})} {number}")
+        elif isinstance(value, list):
+            # Per-session rows: every numeric field becomes a series labelled by session.
+            for field in sorted({key for row in value for key, item in row.items() if _is_number(item)}):
+                lines.append(f"# TYPE {prefix}_session_{field} gauge")
+                for row in value:
+                    lines.append(f"{prefix}_session_{field}{_labels({'session': row['session']})} {row[field]}")
+        elif _is_number(value):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# Emits a JSON snapshot line every `interval` seconds (and once at the end),
+# and rewrites the Prometheus text file alongside it so a node_exporter
+# textfile collector or a quick `cat` sees current numbers.
+class MetricsReporter:
+    def __init__(
+        self,
+        metrics: Metrics,
+        interval: float,
+        log_path: str = "",
+        prometheus_path: str = "",
+    ) -> None:
+        self.metrics = metrics
+        self.interval = interval
+        self.prometheus_path = prometheus_path
+        self._log: TextIO = open(log_path, "a", encoding="utf-8") if log_path else sys.stderr
+        self._task: Optional[asyncio.Task] = None
+
+    def emit(self, event: str = "metrics") -> None:
+        snapshot = self.metrics.snapshot()
+        line = dict(snapshot, event=event)
+        self._log.write(json.dumps(line, ensure_ascii=False, default=str) + "\n")
+        self._log.flush()
+        if self.prometheus_path:
+            tmp_path = f"{self.prometheus_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                handle.write(prometheus_text(snapshot))
+            os.replace(tmp_path, self.prometheus_path)
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.emit()
+
+    def start(self) -> None:
+        if self.interval > 0:
+            self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self.emit("final")
+        if self._log is not sys.stderr:
+            self._log.close()
+
+
+def add_metrics_arguments(parser: Any) -> None:
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=60.0,
+        help="Seconds between JSON metrics lines (0 = only the final one)",
+    )
+    parser.add_argument("--metrics-log", type=str, default="", help="Append metrics lines here instead of stderr")
+    parser.add_argument("--metrics-prom", type=str, default="", help="Keep a Prometheus text-format dump here")
+    parser.add_argument("--no-metrics", action="store_true", help="Disable metrics lines")
+
+
+def open_reporter(args: Any, metrics: Metrics) -> Optional[MetricsReporter]:
+    if args.no_metrics:
+        return None
+    return MetricsReporter(metrics, args.metrics_interval, args.metrics_log, args.metrics_prom)
@@ -0,0 +1,66 @@
+from typing import Any, Dict, Optional
+
+
+def extract_int(value: Any) -> Optional[int]:
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(float(str(value).replace(",", "")))
+    except ValueError:
+        return None
+
+
+def profile_url(username: str) -> str:
+    return f"https://www.tiktok.com/@{username}"
+
+
+def _first_int(stats: Dict[str, Any], *keys: str) -> Optional[int]:
+    for key in keys:
+        value = extract_int(stats.get(key))
+        if value is not None:
+            return value
+    return None
+
+
+def user_fields(payload: Any) -> Dict[str, Any]:
+    # One shape for every payload TikTokApi hands back: user-info responses
+    # ({"userInfo": {"user", "stats"}}), search results and hashtag videos
+    # ({"author", "authorStats"}), flat export rows, or the User/Video objects
+    # themselves. Search results are User objects without as_dict, so their
+    # username/sec_uid/user_id attributes are read first.
+    if isinstance(payload, dict):
+        record = payload
+    else:
+        record = getattr(payload, "as_dict", None) or {}
+    user_info = record.get("userInfo") or {}
+    user = (
+        user_info.get("user")
+        or record.get("user")
+        or record.get("author")
+        or record.get("user_info")
+        or record
+    )
+    stats = (
+        user_info.get("stats")
+        or record.get("stats")
+        or record.get("authorStats")
+        or record.get("authorStatsV2")
+        or record
+    )
+    username = getattr(payload, "username", None) or (
+        user.get("uniqueId") or user.get("unique_id") or user.get("username") or ""
+    )
+    return {
+        "username": str(username).lstrip("@"),
+        "name": user.get("nickname") or user.get("displayName") or user.get("name") or "",
+        "signature": user.get("signature") or user.get("bio") or user.get("desc") or "",
+        "region": user.get("region") or user.get("regionCode") or user.get("region_code") or "",
+        "followers": _first_int(stats, "followerCount", "followers", "followers_count"),
+        "video_count": _first_int(stats, "videoCount", "video_count", "videos"),
+        "sec_uid": getattr(payload, "sec_uid", None) or user.get("secUid") or user.get("sec_uid") or "",
+        "user_id": str(
+            getattr(payload, "user_id", None) or user.get("id") or user.get("user_id") or ""
+        ),
+    }
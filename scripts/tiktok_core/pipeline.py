@@ -0,0 +1,586 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+import traceback
+from contextlib import aclosing
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .batch import run_workers
+from .checkpoint import Checkpoint
+from .metrics import Metrics, add_metrics_arguments, open_reporter
+from .payloads import user_fields
+from .rate_limit import (
+    DEFAULT_PAGE_SIZE,
+    add_rate_arguments,
+    call_with_retries,
+    open_limiter,
+    open_retry,
+    paginate_with_retries,
+)
+from .records import CreatorRecord, SourceLabels
+from .replay import Recorder, add_replay_arguments
+from .session_pool import (
+    add_browser_arguments,
+    add_session_arguments,
+    load_ms_tokens,
+    load_proxies,
+    open_api,
+    open_pool,
+    session_count,
+)
+from .stream import CreatorStream, add_stream_arguments, compact, finalize_results, write_outputs
+from .user_cache import add_cache_arguments, open_cache
+
+Fields = Dict[str, Any]
+
+# Waits shorter than this for the next paginator item mean the item came from
+# a page TikTokApi already fetched; longer waits are timed as a page request.
+_PAGE_WAIT = 0.001
+
+
+# A source is one paginated TikTok listing. Its key is both the source label
+# recorded on creators ("search:cairo") and the key its progress is saved under.
+class SearchUsersSource:
+    def __init__(self, query: str, limit: int) -> None:
+        self.key = f"search:{query}"
+        self.stage = "search_page"
+        self.query = query
+        self.limit = limit
+        # Users per search request (TikTokApi's default count).
+        self.page_size = 10
+        self.title = f"Searching users for: {query}"
+        self.error = f"Search error for {query}"
+        self.label = f"search {query!r}"
+
+    def pages(self, api: Any) -> Callable[[int, int, int], Any]:
+        return lambda cursor, count, session_index: api.search.users(
+            self.query, count=count, cursor=cursor, session_index=session_index
+        )
+
+
+class HashtagVideosSource:
+    def __init__(self, tag: str, limit: int) -> None:
+        self.key = f"hashtag:{tag}"
+        self.stage = "hashtag_page"
+        self.tag = tag
+        self.limit = limit
+        self.page_size = DEFAULT_PAGE_SIZE
+        self.title = f"Fetching hashtag videos: {tag}"
+        self.error = f"Hashtag error for {tag}"
+        self.label = f"hashtag {tag!r}"
+
+    def pages(self, api: Any) -> Callable[[int, int, int], Any]:
+        hashtag = api.hashtag(name=self.tag)
+        return lambda cursor, count, session_index: hashtag.videos(
+            count=count, cursor=cursor, session_index=session_index
+        )
+
+
+async def _gather_until(coros: List[Awaitable[None]], stop: asyncio.Event) -> None:
+    # Run coroutines concurrently and cancel whatever is left once `stop` is set.
+    tasks = {asyncio.ensure_future(coro) for coro in coros}
+    stopper = asyncio.ensure_future(stop.wait())
+    try:
+        while tasks and not stop.is_set():
+            _, tasks = await asyncio.wait(tasks | {stopper}, return_when=asyncio.FIRST_COMPLETED)
+            tasks.discard(stopper)
+    finally:
+        stopper.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# source -> normalize -> filter -> registry -> enrich -> sink. The discovery
+# scripts only supply the stage callables (how a creator record is built,
+# updated and enriched, which ones are kept, and the output columns);
+# session pooling, rate limiting, retries, caching, streaming and
+# checkpointing all live here.
+#   normalize(payload) -> fields          default: payloads.user_fields
+#   accept(fields, source_key) -> bool    filter; rejected creators are counted
+#   build(fields, source_key) -> record   first sighting of a username
+#   update(record, fields, source_key) -> bool  later sightings; True if changed
+#   needs_info(record) -> bool            whether to fetch user info
+#   apply_info(record, fields)            merge the user-info fields
+# Source labels are tracked by the pipeline as a bitmask on each record.
+class CreatorPipeline:
+    def __init__(
+        self,
+        columns: Sequence[str],
+        build: Callable[[Fields, str], CreatorRecord],
+        update: Callable[[CreatorRecord, Fields, str], bool],
+        apply_info: Callable[[CreatorRecord, Fields], None],
+        needs_info: Callable[[CreatorRecord], bool],
+        accept: Optional[Callable[[Fields, str], bool]] = None,
+        normalize: Callable[[Any], Fields] = user_fields,
+        max_creators: int = 0,
+        stream: Optional[CreatorStream] = None,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> None:
+        self.columns = columns
+        self.build = build
+        self.update = update
+        self.apply_info = apply_info
+        self.needs_info = needs_info
+        self.accept = accept
+        self.normalize = normalize
+        self.max_creators = max_creators
+        self.stream = stream
+        self.checkpoint = checkpoint
+        self.creators: Dict[str, CreatorRecord] = {}
+        # Stable ids ("id:<user_id>", "sec:<sec_uid>") -> registry username, so
+        # an account seen under two usernames is kept, and fetched, only once.
+        self.identities: Dict[str, str] = {}
+        self.labels = SourceLabels()
+        # Per-source count of results already consumed, used as the resume cursor.
+        self.positions: Dict[str, int] = {}
+        self.completed: Set[str] = set()
+        self.enriched: Set[str] = set()
+        self.source_keys: List[str] = []
+        self.discovered = 0
+        self.filtered_out = 0
+        self.merged = 0
+        self.limit_hit = asyncio.Event()
+        self.pool: Any = None
+        self.limiter: Any = None
+        self.retry: Any = None
+        self.recorder: Optional[Recorder] = None
+        self.metrics = Metrics()
+        self.active_sources = 0
+        self._pending: Optional[asyncio.Queue] = None
+        # Wall seconds per stage. normalize/filter/registry are summed per
+        # item inside discovery (registry includes filter); the rest of the
+        # discovery time is spent waiting on TikTok.
+        self.timings: Dict[str, float] = dict.fromkeys(
+            ("discover", "normalize", "filter", "registry", "enrich", "sink"), 0.0
+        )
+
+    def full(self) -> bool:
+        return self.max_creators > 0 and len(self.creators) >= self.max_creators
+
+    def row(self, record: CreatorRecord) -> Dict[str, Any]:
+        return record.to_dict(self.columns, self.labels)
+
+    def _emit(self, record: CreatorRecord) -> None:
+        if self.stream:
+            self.stream.emit(self.row(record))
+
+    def _index(self, record: CreatorRecord) -> None:
+        for key in _identity_keys(record.user_id, record.sec_uid):
+            self.identities.setdefault(key, record.username)
+
+    def _known(self, fields: Fields) -> Optional[CreatorRecord]:
+        # The registered record for these fields: by username, else by stable id.
+        record = self.creators.get(fields["username"])
+        if record is not None:
+            return record
+        for key in _identity_keys(fields.get("user_id"), fields.get("sec_uid")):
+            record = self.creators.get(self.identities.get(key, ""))
+            if record is not None:
+                self.merged += 1
+                self.metrics.inc("identity_merges_total")
+                return record
+        return None
+
+    def add(self, fields: Fields, source_key: str) -> bool:
+        # Returns True only when a new creator was registered.
+        username = fields.get("username")
+        if not username:
+            return False
+        self.discovered += 1
+        if self.accept:
+            started = time.perf_counter()
+            accepted = self.accept(fields, source_key)
+            self.timings["filter"] += time.perf_counter() - started
+            if not accepted:
+                self.filtered_out += 1
+                return False
+        bit = self.labels.bit(source_key)
+        record = self._known(fields)
+        if record is None:
+            if self.full():
+                return False
+            record = self.creators[username] = self.build(fields, source_key)
+            record.sources |= bit
+            self._index(record)
+            self._emit(record)
+            return True
+        new_source = not record.sources & bit
+        record.sources |= bit
+        changed = self.update(record, fields, source_key)
+        self._index(record)
+        if changed or (new_source and "sources" in self.columns):
+            self._emit(record)
+        return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "version": 2,
+            "sources": self.source_keys,
+            "positions": self.positions,
+            "completed": sorted(self.completed),
+            "enriched": sorted(self.enriched),
+            "counts": {"discovered": self.discovered, "filtered_out": self.filtered_out, "merged": self.merged},
+            "creators": {username: self.row(record) for username, record in self.creators.items()},
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        positions = state.get("positions", {})
+        completed = state.get("completed", [])
+        if state.get("version", 1) < 2:
+            # Version 1 was written by the search-only crawler, keyed by query.
+            positions = {f"search:{query}": count for query, count in positions.items()}
+            completed = [f"search:{query}" for query in completed]
+        for username, row in state.get("creators", {}).items():
+            self.creators[username] = CreatorRecord.from_dict(row, self.labels)
+            self._index(self.creators[username])
+        self.positions.update(positions)
+        self.completed.update(completed)
+        self.enriched.update(state.get("enriched", []))
+        # Older checkpoints lack the counters; the summary then covers this run only.
+        counts = state.get("counts", {})
+        self.discovered = counts.get("discovered", 0)
+        self.filtered_out = counts.get("filtered_out", 0)
+        self.merged = counts.get("merged", 0)
+
+    def resume(self) -> bool:
+        state = self.checkpoint.load() if self.checkpoint else None
+        if not state:
+            sys.stderr.write("No checkpoint to resume from; starting fresh.\n")
+            return False
+        self.restore(state)
+        sys.stderr.write(
+            f"Resuming from {self.checkpoint.path}: {len(self.creators)} creators, "
+            f"{len(self.completed)} finished sources, {len(self.enriched)} enriched\n"
+        )
+        return True
+
+    def maybe_checkpoint(self) -> None:
+        if self.checkpoint and self.checkpoint.due():
+            self.checkpoint.save(self.snapshot())
+
+    async def harvest(self, api: Any, source: Any) -> None:
+        start = self.positions.get(source.key, 0)
+        sys.stderr.write(source.title + (f" (from {start})" if start else "") + "\n")
+        items = paginate_with_retries(
+            source.pages(api),
+            source.limit - start,
+            self.pool,
+            self.limiter,
+            self.retry,
+            source.label,
+            cursor=start,
+            page_size=source.page_size,
+        )
+        self.active_sources += 1
+        try:
+            async with aclosing(items):
+                waited = time.perf_counter()
+                async for item in items:
+                    wait = time.perf_counter() - waited
+                    if wait >= _PAGE_WAIT:
+                        self.metrics.observe(source.stage, wait)
+                    self.metrics.inc("items_total", stage=source.stage)
+                    self.positions[source.key] = self.positions.get(source.key, 0) + 1
+                    if self.recorder:
+                        self.recorder.source_item(source.key, item)
+                    started = time.perf_counter()
+                    fields = self.normalize(item)
+                    normalized = time.perf_counter()
+                    added = self.add(fields, source.key)
+                    self.timings["normalize"] += normalized - started
+                    self.timings["registry"] += time.perf_counter() - normalized
+                    self.maybe_checkpoint()
+                    if added and self.full():
+                        self.limit_hit.set()
+                        return
+                    waited = time.perf_counter()
+            self.completed.add(source.key)
+        except Exception as exc:  # noqa: BLE001
+            self.metrics.inc("source_failures_total", stage=source.stage)
+            sys.stderr.write(f"{source.error}: {exc}\n")
+            sys.stderr.write(traceback.format_exc())
+        finally:
+            self.active_sources -= 1
+
+    async def discover(self, api: Any, sources: List[Any], concurrent: bool = False) -> None:
+        pending = [source for source in sources if source.key not in self.completed]
+        if concurrent:
+            sys.stderr.write(
+                f"Running {len(pending)} searches/hashtags concurrently over {len(self.pool)} sessions\n"
+            )
+            await _gather_until([self.harvest(api, source) for source in pending], self.limit_hit)
+            sys.stderr.write(f"Creators collected so far: {len(self.creators)}\n")
+            return
+        for source in pending:
+            if self.full():
+                break
+            await self.harvest(api, source)
+            sys.stderr.write(f"Creators collected so far: {len(self.creators)}\n")
+
+    def _settle(self, username: str, record: CreatorRecord, fields: Fields) -> CreatorRecord:
+        # Re-key a record after user info: follow a rename, and fold it into
+        # an entry already registered for the same account (by current
+        # username or stable id), keeping the earlier entry and both sources.
+        info_username = fields["username"] or username
+        existing = self.creators.get(info_username)
+        if existing is None:
+            for key in _identity_keys(fields["user_id"], fields["sec_uid"]):
+                existing = self.creators.get(self.identities.get(key, ""))
+                if existing is not None:
+                    break
+        if existing is record:
+            existing = None
+        if existing is None and info_username == username:
+            return record
+        self.creators.pop(username, None)
+        keys = _identity_keys(record.user_id, record.sec_uid)
+        if existing is not None:
+            existing.sources |= record.sources
+            self.merged += 1
+            self.metrics.inc("identity_merges_total")
+            record = existing
+        else:
+            self.creators[info_username] = record
+            record.username = info_username
+        for key in keys + _identity_keys(fields["user_id"], fields["sec_uid"]):
+            self.identities[key] = record.username
+        if self.stream:
+            self.stream.drop(username)
+        return record
+
+    async def enrich(self, api: Any, cache: Any, workers: int = 0) -> None:
+        pending: asyncio.Queue = asyncio.Queue()
+        self._pending = pending
+        # The registry holds each account once (see _known), so every queued
+        # record is a distinct account; one merged away by _settle while the
+        # queue drains is skipped below.
+        for username, record in self.creators.items():
+            if username not in self.enriched and self.needs_info(record):
+                pending.put_nowait((username, record))
+        workers = workers if workers > 0 else len(self.pool)
+        sys.stderr.write(
+            f"Fetching user info for {pending.qsize()} creators "
+            f"({workers} workers over {len(self.pool)} sessions)...\n"
+        )
+
+        async def fetch_info(username: str, sec_uid: str, user_id: str, session_index: int) -> Dict[str, Any]:
+            started = time.perf_counter()
+            self.metrics.inc("requests_total", stage="user_info")
+            try:
+                return await api.user(
+                    username=username, sec_uid=sec_uid or None, user_id=user_id or None
+                ).info(session_index=session_index)
+            except Exception as exc:
+                self.metrics.inc("errors_total", stage="user_info", error=type(exc).__name__)
+                raise
+            finally:
+                self.metrics.observe("user_info", time.perf_counter() - started)
+
+        async def enrich_one(item: Tuple[str, CreatorRecord]) -> None:
+            username, record = item
+            if self.creators.get(record.username) is not record or record.username in self.enriched:
+                return
+            sec_uid = record.sec_uid
+            try:
+                info = cache.get(username, sec_uid) if cache else None
+                if info is not None:
+                    self.metrics.inc("cache_hits_total", stage="user_info")
+                else:
+                    info = await call_with_retries(
+                        lambda session_index: fetch_info(username, sec_uid, record.user_id, session_index),
+                        self.pool,
+                        self.limiter,
+                        self.retry,
+                        f"user info for {username}",
+                    )
+                    if cache:
+                        cache.put(info, username, sec_uid)
+                if self.recorder:
+                    self.recorder.user_info(username, info)
+                fields = user_fields(info)
+                record = self._settle(username, record, fields)
+                self.apply_info(record, fields)
+                self._index(record)
+                self.enriched.add(username)
+                self.enriched.add(record.username)
+                self._emit(record)
+            except Exception as exc:  # noqa: BLE001
+                sys.stderr.write(f"User info error for {username}: {exc}\n")
+            self.maybe_checkpoint()
+
+        await run_workers(pending, enrich_one, workers)
+
+    async def _crawl(self, args: argparse.Namespace, sources: List[Any], ms_tokens: List[str]) -> None:
+        proxies = load_proxies(args.proxy, args.proxies_file)
+        async with open_api(args, ms_tokens, self.pool, proxies) as api:
+            started = time.perf_counter()
+            await self.discover(api, sources, args.concurrent)
+            self.timings["discover"] = time.perf_counter() - started
+            if not args.fetch_info:
+                return
+            cache = open_cache(args)
+            started = time.perf_counter()
+            try:
+                await self.enrich(api, cache, args.info_concurrency)
+            finally:
+                self.timings["enrich"] = time.perf_counter() - started
+                if cache:
+                    sys.stderr.write(cache.summary() + "\n")
+                    cache.close()
+
+    async def run(self, args: argparse.Namespace, sources: List[Any], title: str) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        # A replay needs no real token; one placeholder keeps a single session.
+        ms_tokens = ["replay"] if args.replay else load_ms_tokens(args.tokens_file)
+        sys.stderr.write(f"{title}\n")
+        sys.stderr.write(f"Python: {sys.version.split()[0]}\n")
+        sys.stderr.write(f"Browser: {args.browser}\n")
+        sys.stderr.write(f"Headless: {args.headless}\n")
+        sys.stderr.write(f"ms_tokens: {len(ms_tokens)}\n")
+
+        self.pool = open_pool(args, session_count(args, ms_tokens))
+        self.limiter = open_limiter(args, len(self.pool))
+        self.retry = open_retry(args)
+        self.source_keys = [source.key for source in sources]
+        self.recorder = Recorder(args.record) if args.record else None
+        self._register_gauges(started)
+        reporter = open_reporter(args, self.metrics)
+        if reporter:
+            reporter.start()
+        try:
+            await self._crawl(args, sources, ms_tokens)
+        except BaseException:
+            if self.checkpoint:
+                self.checkpoint.save(self.snapshot())
+                sys.stderr.write(f"Checkpoint saved to {self.checkpoint.path}; rerun with --resume.\n")
+            raise
+        finally:
+            if reporter:
+                await reporter.stop()
+            if self.recorder:
+                self.recorder.close()
+            if self.stream:
+                # Every line is flushed as it is written, so an aborted crawl
+                # still leaves a usable stream for tiktok_stream.py to compact.
+                self.stream.close()
+            sys.stderr.write(self.pool.summary() + "\n")
+            sys.stderr.write(self.limiter.summary() + "\n")
+
+        sys.stderr.write(
+            f"Discovery summary: discovered={self.discovered}, "
+            f"kept={len(self.creators)}, filtered_out={self.filtered_out}, merged={self.merged}\n"
+        )
+        csv_path = None if args.no_csv else args.output
+        sink_started = time.perf_counter()
+        if self.stream:
+            results = compact(self.stream.path, csv_path, args.json_output, args.min_followers)
+        else:
+            results = finalize_results(
+                (self.row(record) for record in self.creators.values()), args.min_followers
+            )
+            write_outputs(results, csv_path, args.json_output)
+        self.timings["sink"] = time.perf_counter() - sink_started
+        if self.checkpoint:
+            self.checkpoint.clear()
+        if args.stats_output:
+            self.write_stats(args.stats_output, time.perf_counter() - started)
+        return results
+
+    def _register_gauges(self, started: float) -> None:
+        def creators_per_second() -> float:
+            elapsed = time.perf_counter() - started
+            return round(len(self.creators) / elapsed, 2) if elapsed > 0 else 0.0
+
+        self.metrics.gauge("creators", lambda: len(self.creators))
+        self.metrics.gauge("creators_per_second", creators_per_second)
+        self.metrics.gauge("discovered", lambda: self.discovered)
+        self.metrics.gauge("filtered_out", lambda: self.filtered_out)
+        self.metrics.gauge("enriched", lambda: len(self.enriched))
+        self.metrics.gauge(
+            "queue_depth",
+            lambda: {"user_info": self._pending.qsize() if self._pending else 0, "sources": self.active_sources},
+        )
+        self.metrics.gauge("in_flight", lambda: sum(health.in_flight for health in self.pool.health))
+        self.metrics.gauge("rate", lambda: round(self.limiter.rate, 3))
+        self.metrics.gauge("retries", lambda: self.limiter.retries)
+        self.metrics.gauge("sessions", self.pool.stats)
+
+    def stats(self, seconds: float) -> Dict[str, Any]:
+        timings = dict(self.timings)
+        timings["fetch"] = max(0.0, timings["discover"] - timings["normalize"] - timings["registry"])
+        return {
+            "creators": len(self.creators),
+            "discovered": self.discovered,
+            "filtered_out": self.filtered_out,
+            "merged": self.merged,
+            "enriched": len(self.enriched),
+            "seconds": round(seconds, 3),
+            "creators_per_second": round(len(self.creators) / seconds, 1) if seconds else 0.0,
+            "items_per_second": round(self.discovered / timings["discover"], 1) if timings["discover"] else 0.0,
+            "timings": {stage: round(value, 4) for stage, value in timings.items()},
+            "latency": {
+                stage: {key: histogram[key] for key in ("count", "mean", "p50", "p95", "max")}
+                for stage, histogram in self.metrics.snapshot()["stages"].items()
+            },
+        }
+
+    def write_stats(self, path: str, seconds: float) -> None:
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.stats(seconds), handle, indent=2)
+        sys.stderr.write(f"Wrote stats: {path}\n")
+
+
+def _identity_keys(user_id: Any, sec_uid: Any) -> List[str]:
+    keys = []
+    if user_id:
+        keys.append(f"id:{user_id}")
+    if sec_uid:
+        keys.append(f"sec:{sec_uid}")
+    return keys
+
+
+def parse_list(value: str) -> List[str]:
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def add_pipeline_arguments(parser: argparse.ArgumentParser) -> None:
+    # Flags shared by every discovery script; each script adds its own
+    # queries, limits and --output default.
+    parser.add_argument("--min-followers", type=int, default=0)
+    parser.add_argument("--json-output", type=str, default="")
+    parser.add_argument("--no-csv", action="store_true")
+    add_stream_arguments(parser)
+    parser.add_argument("--fetch-info", action="store_true", dest="fetch_info")
+    parser.add_argument("--no-fetch-info", action="store_false", dest="fetch_info")
+    parser.set_defaults(fetch_info=True)
+    parser.add_argument(
+        "--info-sleep",
+        type=float,
+        default=0.3,
+        help="Seconds between calls per session; sets the starting --rate",
+    )
+    parser.add_argument(
+        "--info-concurrency",
+        type=int,
+        default=0,
+        help="Concurrent user info requests (default: one per session)",
+    )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Run all sources (searches/hashtags) at once across the session pool",
+    )
+    add_cache_arguments(parser)
+    add_browser_arguments(parser)
+    add_session_arguments(parser)
+    add_rate_arguments(parser)
+    add_replay_arguments(parser)
+    add_metrics_arguments(parser)
+    parser.add_argument(
+        "--stats-output", type=str, default="", help="Write run counters and stage timings as JSON"
+    )
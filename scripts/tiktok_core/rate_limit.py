@@ -0,0 +1,218 @@
+import asyncio
+import random
+import sys
+import time
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, TypeVar
+
+from .session_pool import NOT_COUNTED_ERRORS, SessionPool
+
+T = TypeVar("T")
+
+# Errors that retrying will not fix (TikTokApi.exceptions, matched by name).
+PERMANENT_ERRORS = NOT_COUNTED_ERRORS | {"InvalidJSONException"}
+# Results TikTokApi asks for per request in its paginators (challenge/item_list).
+DEFAULT_PAGE_SIZE = 30
+
+
+def is_transient(exc: BaseException) -> bool:
+    return isinstance(exc, Exception) and type(exc).__name__ not in PERMANENT_ERRORS
+
+
+# Token bucket shared by every TikTok call. The rate adapts AIMD-style: each
+# success nudges it up towards max_rate, each transient error or empty
+# response halves it (down to min_rate), so a crawl settles just under what
+# TikTok tolerates. Permanent errors (not found, bad JSON) say nothing about
+# throttling and leave the rate alone.
+class AdaptiveRateLimiter:
+    def __init__(
+        self,
+        rate: float,
+        min_rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        burst: float = 1.0,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+    ) -> None:
+        # rate <= 0 disables limiting; retries still back off.
+        self.rate = rate
+        self.start_rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 8
+        self.max_rate = max_rate if max_rate is not None else rate * 2
+        self.burst = burst
+        self.step = rate * increase
+        self.decrease = decrease
+        self.successes = 0
+        self.failures = 0
+        self.empty = 0
+        self.permanent = 0
+        self.retries = 0
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 1
+                self._updated = time.monotonic()
+            self._tokens -= 1
+
+    def record_success(self) -> None:
+        self.successes += 1
+        if self.rate > 0:
+            self.rate = min(self.max_rate, self.rate + self.step)
+
+    def record_failure(self, empty: bool = False) -> None:
+        if empty:
+            self.empty += 1
+        else:
+            self.failures += 1
+        if self.rate > 0:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+
+    def summary(self) -> str:
+        if self.start_rate <= 0:
+            limits = "unlimited"
+        else:
+            limits = f"{self.rate:.2f} req/s (start {self.start_rate:.2f}, range {self.min_rate:.2f}-{self.max_rate:.2f})"
+        return (
+            f"Rate limiter: {limits}, successes={self.successes}, failures={self.failures}, "
+            f"empty={self.empty}, permanent={self.permanent}, retries={self.retries}"
+        )
+
+
+class RetryPolicy:
+    def __init__(self, retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0) -> None:
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        # Full jitter: concurrent workers that failed together retry apart.
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+async def _backoff(
+    exc: BaseException,
+    attempt: int,
+    limiter: AdaptiveRateLimiter,
+    retry: RetryPolicy,
+    label: str,
+    pool: SessionPool,
+    session_index: Optional[int],
+) -> None:
+    if not is_transient(exc):
+        limiter.permanent += 1
+        raise exc
+    limiter.record_failure()
+    if attempt >= retry.retries:
+        raise exc
+    limiter.retries += 1
+    if session_index is not None:
+        # Charged to the session whose failure caused the retry.
+        pool.health[session_index].retries += 1
+    delay = retry.delay(attempt)
+    sys.stderr.write(f"Retrying {label} in {delay:.1f}s after {type(exc).__name__}: {exc}\n")
+    await asyncio.sleep(delay)
+
+
+async def call_with_retries(
+    call: Callable[[int], Awaitable[T]],
+    pool: SessionPool,
+    limiter: AdaptiveRateLimiter,
+    retry: RetryPolicy,
+    label: str,
+) -> T:
+    # One request per attempt; each attempt may land on a different session.
+    attempt = 0
+    while True:
+        await limiter.acquire()
+        session_index = None
+        try:
+            async with pool.session() as session_index:
+                result = await call(session_index)
+        except Exception as exc:  # noqa: BLE001
+            await _backoff(exc, attempt, limiter, retry, label, pool, session_index)
+            attempt += 1
+            continue
+        limiter.record_success()
+        return result
+
+
+async def paginate_with_retries(
+    pages: Callable[[int, int, int], AsyncIterator[Any]],
+    count: int,
+    pool: SessionPool,
+    limiter: AdaptiveRateLimiter,
+    retry: RetryPolicy,
+    label: str,
+    cursor: int = 0,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> AsyncIterator[Any]:
+    # pages(cursor, count, session_index) opens a TikTokApi paginator. It is
+    # opened for one page (page_size results) at a time, so every page request
+    # waits for the limiter and feeds its success, empty page or failure back
+    # into the rate. The session is held only while the page is fetched and is
+    # released before its items reach the consumer, so per-session requests,
+    # latency and errors describe TikTok requests alone. A page that fails is
+    # retried from its start, so nothing is yielded twice.
+    consumed = 0
+    attempt = 0
+    while consumed < count:
+        wanted = min(page_size, count - consumed)
+        await limiter.acquire()
+        page: List[Any] = []
+        session_index = None
+        try:
+            async with pool.session() as session_index:
+                async with aclosing(pages(cursor + consumed, wanted, session_index)) as paginator:
+                    async for item in paginator:
+                        page.append(item)
+                        if len(page) >= wanted:
+                            break
+        except Exception as exc:  # noqa: BLE001
+            await _backoff(exc, attempt, limiter, retry, label, pool, session_index)
+            attempt += 1
+            continue
+        attempt = 0
+        if not page:
+            limiter.record_failure(empty=True)
+            return
+        limiter.record_success()
+        consumed += len(page)
+        for item in page:
+            yield item
+        if len(page) < wanted:
+            # A short page is the end of the listing.
+            return
+
+
+def add_rate_arguments(parser: Any) -> None:
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.0,
+        help="Starting TikTok request rate across all sessions, req/s (default: sessions / --info-sleep)",
+    )
+    parser.add_argument("--max-rate", type=float, default=0.0, help="Upper bound for the adaptive rate")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per call on transient errors")
+    parser.add_argument("--backoff", type=float, default=1.0, help="Base retry backoff in seconds")
+    parser.add_argument("--max-backoff", type=float, default=30.0)
+
+
+def open_limiter(args: Any, sessions: int) -> AdaptiveRateLimiter:
+    rate = args.rate
+    if rate <= 0 and args.info_sleep > 0:
+        rate = sessions / args.info_sleep
+    return AdaptiveRateLimiter(rate, max_rate=args.max_rate or None)
+
+
+def open_retry(args: Any) -> RetryPolicy:
+    return RetryPolicy(args.retries, args.backoff, args.max_backoff)
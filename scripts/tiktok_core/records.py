@@ -0,0 +1,119 @@
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .payloads import profile_url
+
+# Output keys that are stored under another attribute (or derived) on
+# CreatorRecord; every other key maps to the attribute of the same name.
+_ALIASES = {"bio": "signature", "videos": "video_count"}
+_DERIVED = {"profile_url", "sources"}
+
+
+# Interns source labels ("search:cairo", "hashtag:egypt") to bit positions so
+# each creator stores the sources it was seen in as one int.
+class SourceLabels:
+    def __init__(self) -> None:
+        self.labels: List[str] = []
+        self._bits: Dict[str, int] = {}
+
+    def bit(self, label: str) -> int:
+        index = self._bits.get(label)
+        if index is None:
+            index = self._bits[label] = len(self.labels)
+            self.labels.append(sys.intern(label))
+        return 1 << index
+
+    def mask(self, labels: Iterable[str]) -> int:
+        mask = 0
+        for label in labels:
+            mask |= self.bit(label)
+        return mask
+
+    def names(self, mask: int) -> List[str]:
+        names = []
+        index = 0
+        while mask:
+            if mask & 1:
+                names.append(self.labels[index])
+            mask >>= 1
+            index += 1
+        return sorted(names)
+
+
+def _intern(value: Optional[str]) -> str:
+    # Regions and location hints repeat across most creators; share one copy.
+    return sys.intern(value) if value else ""
+
+
+# One discovered creator. Slots instead of a per-creator dict (plus a side set
+# of sources) keep millions of hashtag-video authors in a fraction of the
+# memory; to_dict() renders the script's output schema only when written out.
+class CreatorRecord:
+    __slots__ = (
+        "username",
+        "name",
+        "signature",
+        "region",
+        "followers",
+        "video_count",
+        "sec_uid",
+        "user_id",
+        "location_hint",
+        "location_source",
+        "sources",
+    )
+
+    def __init__(
+        self,
+        username: str,
+        name: str = "",
+        signature: str = "",
+        region: str = "",
+        followers: Optional[int] = None,
+        video_count: Optional[int] = None,
+        sec_uid: str = "",
+        user_id: str = "",
+        location_hint: str = "",
+        location_source: str = "",
+        sources: int = 0,
+    ) -> None:
+        self.username = username
+        self.name = name or ""
+        self.signature = signature or ""
+        self.region = _intern(region)
+        self.followers = followers
+        self.video_count = video_count
+        self.sec_uid = sec_uid or ""
+        self.user_id = user_id or ""
+        self.location_hint = _intern(location_hint)
+        self.location_source = _intern(location_source)
+        self.sources = sources
+
+    def set_region(self, region: str) -> None:
+        self.region = _intern(region)
+
+    def set_location(self, hint: Optional[str] = None, source: Optional[str] = None) -> None:
+        if hint is not None:
+            self.location_hint = _intern(hint)
+        if source is not None:
+            self.location_source = _intern(source)
+
+    def to_dict(self, columns: Sequence[str], labels: SourceLabels) -> Dict[str, Any]:
+        row: Dict[str, Any] = {}
+        for column in columns:
+            if column == "profile_url":
+                row[column] = profile_url(self.username)
+            elif column == "sources":
+                row[column] = labels.names(self.sources)
+            else:
+                row[column] = getattr(self, _ALIASES.get(column, column))
+        return row
+
+    @classmethod
+    def from_dict(cls, row: Dict[str, Any], labels: SourceLabels) -> "CreatorRecord":
+        values = {
+            _ALIASES.get(key, key): value
+            for key, value in row.items()
+            if key not in _DERIVED and _ALIASES.get(key, key) in cls.__slots__
+        }
+        return cls(sources=labels.mask(row.get("sources") or []), **values)
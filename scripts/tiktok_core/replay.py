@@ -0,0 +1,273 @@
+import asyncio
+import json
+import os
+import random
+import sys
+import types
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+# Offline stand-in for TikTokApi. It replays a fixture of recorded payloads,
+# so the discovery scripts can be run and benchmarked without a live session
+# or ms_token. A fixture is NDJSON with one payload per line:
+#   {"source": "search:cairo", "item": {...}}    a search result, in order
+#   {"source": "hashtag:egypt", "item": {...}}   a hashtag video (as_dict)
+#   {"user_info": "username", "info": {...}}     a user-info response
+# `--record` writes the same format from a live crawl.
+
+
+# Named like TikTokApi.exceptions; the session pool and retry logic match on
+# the class name, so injected failures are handled like real ones.
+class EmptyResponseException(Exception):
+    pass
+
+
+class CaptchaException(Exception):
+    pass
+
+
+class NotFoundException(Exception):
+    pass
+
+
+def load_fixture(path: str) -> Dict[str, Any]:
+    sources: Dict[str, List[Dict[str, Any]]] = {}
+    infos: Dict[str, Dict[str, Any]] = {}
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "source" in record:
+                sources.setdefault(record["source"], []).append(record["item"])
+            elif "user_info" in record:
+                infos[record["user_info"].lower()] = record["info"]
+    return {"sources": sources, "infos": infos}
+
+
+class _ReplayItem:
+    # Search results come back as User objects carrying only identifiers (no
+    # as_dict), hashtag videos as objects whose as_dict is the raw payload.
+    def __init__(self, source: str, item: Dict[str, Any]) -> None:
+        if source.startswith("search:"):
+            self.username = item.get("uniqueId") or item.get("username") or ""
+            self.sec_uid = item.get("secUid") or ""
+            self.user_id = item.get("id") or ""
+        else:
+            self.as_dict = item
+
+
+class _ReplayUser:
+    def __init__(self, api: "ReplayApi", username: Optional[str], sec_uid: Optional[str]) -> None:
+        self.api = api
+        self.username = username or ""
+        self.sec_uid = sec_uid or ""
+
+    async def info(self, session_index: Optional[int] = None, **kwargs: Any) -> Dict[str, Any]:
+        await self.api.call(session_index)
+        info = self.api.infos.get(self.username.lower())
+        if info is None and self.sec_uid:
+            info = self.api.infos_by_sec_uid.get(self.sec_uid)
+        if info is None:
+            raise NotFoundException(f"no recorded user info for {self.username}")
+        return info
+
+
+class _ReplaySearch:
+    def __init__(self, api: "ReplayApi") -> None:
+        self.api = api
+
+    def users(self, query: str, count: int = 10, cursor: int = 0, **kwargs: Any) -> AsyncIterator[Any]:
+        return self.api.page(f"search:{query}", count, cursor, kwargs.get("session_index"))
+
+
+class _ReplayHashtag:
+    def __init__(self, api: "ReplayApi", name: str) -> None:
+        self.api = api
+        self.name = name
+
+    def videos(self, count: int = 30, cursor: int = 0, **kwargs: Any) -> AsyncIterator[Any]:
+        return self.api.page(f"hashtag:{self.name}", count, cursor, kwargs.get("session_index"))
+
+
+class ReplayApi:
+    def __init__(
+        self,
+        fixture: Dict[str, Any],
+        latency: float = 0.05,
+        error_rate: float = 0.0,
+        captcha_rate: float = 0.0,
+        page_size: int = 30,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.sources = fixture["sources"]
+        self.infos = fixture["infos"]
+        self.infos_by_sec_uid: Dict[str, Dict[str, Any]] = {}
+        for info in self.infos.values():
+            user = (info.get("userInfo") or {}).get("user") or {}
+            if user.get("secUid"):
+                self.infos_by_sec_uid[user["secUid"]] = info
+        self.latency = latency
+        self.error_rate = error_rate
+        self.captcha_rate = captcha_rate
+        self.page_size = page_size
+        self.random = random.Random(seed)
+        self.calls = 0
+        self.failures = 0
+        self.sessions: List[Any] = []
+        self.search = _ReplaySearch(self)
+
+    async def __aenter__(self) -> "ReplayApi":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        sys.stderr.write(f"Replay: {self.calls} calls, {self.failures} injected failures\n")
+
+    async def create_sessions(
+        self, ms_tokens: Optional[List[str]] = None, num_sessions: int = 1, **kwargs: Any
+    ) -> None:
+        tokens = ms_tokens or [""]
+        proxies = kwargs.get("proxies") or [None]
+        self.sessions = [
+            types.SimpleNamespace(
+                ms_token=tokens[index % len(tokens)], proxy=proxies[index % len(proxies)], is_valid=True
+            )
+            for index in range(num_sessions)
+        ]
+
+    def user(self, username: Optional[str] = None, sec_uid: Optional[str] = None, **kwargs: Any) -> _ReplayUser:
+        return _ReplayUser(self, username, sec_uid)
+
+    def hashtag(self, name: str, **kwargs: Any) -> _ReplayHashtag:
+        return _ReplayHashtag(self, name)
+
+    async def call(self, session_index: Optional[int]) -> None:
+        # One simulated request: latency with +-50% jitter, then maybe a failure.
+        self.calls += 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency * self.random.uniform(0.5, 1.5))
+        roll = self.random.random()
+        if roll < self.captcha_rate:
+            self.failures += 1
+            raise CaptchaException(f"injected captcha on session {session_index}")
+        if roll < self.captcha_rate + self.error_rate:
+            self.failures += 1
+            raise EmptyResponseException("injected empty response")
+
+    async def page(self, source: str, count: int, cursor: int, session_index: Optional[int]) -> AsyncIterator[Any]:
+        # Like TikTokApi's paginators: one request per page_size items.
+        items = self.sources.get(source, [])
+        end = min(cursor + count, len(items))
+        for offset in range(cursor, end):
+            if (offset - cursor) % self.page_size == 0:
+                await self.call(session_index)
+            yield _ReplayItem(source, items[offset])
+
+
+def open_replay_api(args: Any) -> ReplayApi:
+    return ReplayApi(
+        load_fixture(args.replay),
+        latency=args.replay_latency,
+        error_rate=args.replay_error_rate,
+        captcha_rate=args.replay_captcha_rate,
+        seed=args.replay_seed,
+    )
+
+
+# Writes what a live crawl receives as a replay fixture.
+class Recorder:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        self._handle = open(path, "w", encoding="utf-8")
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._handle.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def source_item(self, source: str, item: Any) -> None:
+        payload = getattr(item, "as_dict", None)
+        if not payload:
+            payload = {
+                "uniqueId": getattr(item, "username", None) or "",
+                "secUid": getattr(item, "sec_uid", None) or "",
+                "id": getattr(item, "user_id", None) or "",
+            }
+        self._write({"source": source, "item": payload})
+
+    def user_info(self, username: str, info: Dict[str, Any]) -> None:
+        self._write({"user_info": username, "info": info})
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+def synthesize_fixture(
+    path: str,
+    queries: List[str],
+    hashtags: List[str],
+    per_source: int = 500,
+    creators: int = 5000,
+    egypt_share: float = 0.4,
+    seed: int = 7,
+) -> None:
+    # Sources draw from one pool of creators, so the same account shows up
+    # under several searches/hashtags and the merge path is exercised.
+    rng = random.Random(seed)
+    regions = ["EG"] * 3 + ["SA", "AE", "US", ""]
+
+    def user(index: int) -> Dict[str, Any]:
+        local = rng.random() < egypt_share
+        return {
+            "id": str(7_000_000_000_000_000_000 + index),
+            "uniqueId": f"creator_{index}",
+            "nickname": f"Creator {index}",
+            "signature": "Content creator | Cairo, Egypt" if local else "Content creator",
+            "secUid": f"MS4wLjABAAAA{index:032d}",
+            "region": rng.choice(regions) if local else rng.choice(regions[3:]),
+        }
+
+    users = [user(index) for index in range(creators)]
+    # Fixed per account, so results do not depend on which sighting came first.
+    stats = [
+        {"followerCount": rng.randint(0, 2_000_000), "videoCount": rng.randint(0, 900)}
+        for _ in range(creators)
+    ]
+    output_dir = os.path.dirname(path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        def write(record: Dict[str, Any]) -> None:
+            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        for query in queries:
+            for index in rng.sample(range(creators), min(per_source, creators)):
+                identity = {key: users[index][key] for key in ("uniqueId", "secUid", "id")}
+                write({"source": f"search:{query}", "item": identity})
+        for tag in hashtags:
+            for video in range(per_source):
+                index = rng.randrange(creators)
+                author = {key: value for key, value in users[index].items() if key != "region"}
+                # Only some video payloads carry author stats; the rest need user info.
+                author_stats = {"followerCount": stats[index]["followerCount"]} if rng.random() < 0.5 else {}
+                item = {"id": f"{tag}-{video}", "author": author, "authorStats": author_stats}
+                write({"source": f"hashtag:{tag}", "item": item})
+        for user_data, user_stats in zip(users, stats):
+            info = {"userInfo": {"user": user_data, "stats": user_stats}}
+            write({"user_info": user_data["uniqueId"], "info": info})
+
+
+def add_replay_arguments(parser: Any) -> None:
+    parser.add_argument(
+        "--replay",
+        type=str,
+        default="",
+        help="Replay a recorded fixture (NDJSON) instead of calling TikTok; no ms_token needed",
+    )
+    parser.add_argument("--replay-latency", type=float, default=0.05, help="Seconds per replayed request")
+    parser.add_argument(
+        "--replay-error-rate", type=float, default=0.0, help="Share of replayed requests that fail"
+    )
+    parser.add_argument("--replay-captcha-rate", type=float, default=0.0)
+    parser.add_argument("--replay-seed", type=int, default=None)
+    parser.add_argument("--record", type=str, default="", help="Record received payloads as a replay fixture")
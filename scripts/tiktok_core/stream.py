@@ -0,0 +1,131 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+CSV_HEADERS = ["name", "username", "profile_url", "followers_count"]
+
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+# Append-only NDJSON log: one line per creator discovered or updated, so
+# downstream loaders can tail the file while the crawl is still running.
+class CreatorStream:
+    def __init__(self, path: str, append: bool = False) -> None:
+        self.path = path
+        self.lines = 0
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        self._handle = open(path, "a" if append else "w", encoding="utf-8")
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        self._handle.write(json.dumps(record, ensure_ascii=False, default=json_default) + "\n")
+        self._handle.flush()
+        self.lines += 1
+
+    def drop(self, username: str) -> None:
+        # Written when a creator is re-keyed (e.g. renamed account) so compaction
+        # forgets the old username.
+        self.emit({"dropped": username})
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+def read_stream(path: str) -> List[Dict[str, Any]]:
+    # Later lines win; dict order keeps each creator where it was first seen.
+    records: Dict[str, Dict[str, Any]] = {}
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crawl killed mid-write leaves a partial last line.
+                continue
+            if "dropped" in record:
+                records.pop(record["dropped"], None)
+            elif record.get("username"):
+                records[record["username"]] = record
+    return list(records.values())
+
+
+def finalize_results(records: Iterable[Dict[str, Any]], min_followers: int = 0) -> List[Dict[str, Any]]:
+    results = list(records)
+    if min_followers > 0:
+        results = [row for row in results if (row.get("followers") or 0) >= min_followers]
+    results.sort(key=lambda row: row.get("followers") or 0, reverse=True)
+    return results
+
+
+def write_csv(path: str, results: List[Dict[str, Any]]) -> None:
+    output_dir = os.path.dirname(path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(CSV_HEADERS)
+        for row in results:
+            writer.writerow(
+                [
+                    row.get("name") or "",
+                    row.get("username") or "",
+                    row.get("profile_url") or "",
+                    row.get("followers") if row.get("followers") is not None else "",
+                ]
+            )
+    sys.stderr.write(f"Wrote CSV: {path}\n")
+
+
+def write_json(path: str, results: List[Dict[str, Any]]) -> None:
+    if path in {"-", "stdout"}:
+        print(json.dumps(results, ensure_ascii=False, default=json_default))
+        sys.stderr.write("Wrote JSON to stdout.\n")
+        return
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, ensure_ascii=False, indent=2, default=json_default)
+    sys.stderr.write(f"Wrote JSON: {path}\n")
+
+
+def write_outputs(
+    results: List[Dict[str, Any]],
+    csv_path: Optional[str],
+    json_path: str = "",
+) -> None:
+    if csv_path:
+        write_csv(csv_path, results)
+    else:
+        sys.stderr.write("CSV output skipped (--no-csv).\n")
+    if json_path:
+        write_json(json_path, results)
+
+
+def compact(
+    stream_path: str,
+    csv_path: Optional[str],
+    json_path: str = "",
+    min_followers: int = 0,
+) -> List[Dict[str, Any]]:
+    results = finalize_results(read_stream(stream_path), min_followers)
+    sys.stderr.write(f"Compacted {stream_path}: {len(results)} creators\n")
+    write_outputs(results, csv_path, json_path)
+    return results
+
+
+def add_stream_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--stream-output",
+        type=str,
+        default="",
+        help="Append one JSON line per discovered/updated creator to this NDJSON file; "
+        "the CSV/JSON outputs are compacted from it at the end",
+    )
@@ -0,0 +1,93 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = "data/.cache/tiktok_user_info.sqlite3"
+DEFAULT_TTL_HOURS = 24.0
+
+
+class UserInfoCache:
+    def __init__(self, path: str, ttl_hours: float = DEFAULT_TTL_HOURS, refresh: bool = False) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        cache_dir = os.path.dirname(path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS user_info (
+                username TEXT PRIMARY KEY,
+                sec_uid TEXT,
+                info TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS user_info_sec_uid ON user_info(sec_uid)")
+
+    def get(self, username: str = "", sec_uid: str = "") -> Optional[Dict[str, Any]]:
+        if self.refresh:
+            self.misses += 1
+            return None
+        oldest = time.time() - self.ttl_seconds
+        row = None
+        if username:
+            row = self._conn.execute(
+                "SELECT info FROM user_info WHERE username = ? AND fetched_at >= ?",
+                (username.lower(), oldest),
+            ).fetchone()
+        if row is None and sec_uid:
+            # sec_uid survives renames, so it still finds accounts cached under an old username.
+            row = self._conn.execute(
+                "SELECT info FROM user_info WHERE sec_uid = ? AND fetched_at >= ? "
+                "ORDER BY fetched_at DESC LIMIT 1",
+                (sec_uid, oldest),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, info: Dict[str, Any], username: str, sec_uid: str = "") -> None:
+        if not username:
+            return
+        if not sec_uid:
+            user = (info.get("userInfo") or {}).get("user") or info.get("user") or {}
+            sec_uid = user.get("secUid") or user.get("sec_uid") or ""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO user_info (username, sec_uid, info, fetched_at) VALUES (?, ?, ?, ?)",
+            (username.lower(), sec_uid or None, json.dumps(info, ensure_ascii=False), time.time()),
+        )
+
+    def summary(self) -> str:
+        return f"User info cache: hits={self.hits}, misses={self.misses} ({self.path})"
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def add_cache_arguments(parser: Any) -> None:
+    parser.add_argument("--cache-path", type=str, default=DEFAULT_CACHE_PATH)
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_TTL_HOURS,
+        help="Hours before cached user info is fetched again",
+    )
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached user info")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the user info cache")
+
+
+def open_cache(args: Any) -> Optional[UserInfoCache]:
+    if args.no_cache:
+        return None
+    return UserInfoCache(args.cache_path, ttl_hours=args.cache_ttl, refresh=args.refresh)
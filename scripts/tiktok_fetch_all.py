@@ -3,15 +3,34 @@ import asyncio
 import json
 import os
 import sys
+import time
 import traceback
 from urllib.parse import urlparse
-from typing import Any, Dict
+from typing import Any, Awaitable, Callable, Dict, List
 
 from TikTokApi import TikTokApi
 
-
-def _get_ms_token() -> str:
-    return os.environ.get("ms_token") or os.environ.get("MS_TOKEN") or ""
+from tiktok_core import (
+    SUFFIXES,
+    Projection,
+    VideoStore,
+    add_browser_arguments,
+    add_download_arguments,
+    add_dump_arguments,
+    add_session_arguments,
+    check_compression,
+    download_video,
+    download_videos,
+    load_ms_tokens,
+    load_proxies,
+    open_dump,
+    open_pool,
+    run_batch,
+    run_section,
+    session_count,
+    start_sessions,
+    write_ndjson,
+)
 
 
 def _summarize(obj: Any) -> Dict[str, Any]:
@@ -23,25 +42,202 @@ def _summarize(obj: Any) -> Dict[str, Any]:
     return {"value": obj}
 
 
+async def _store(target: Dict[str, Any], key: str, call: Awaitable[Any]) -> None:
+    target[key] = await call
+
+
+# Item lists split out of the output by --dump-dir: file name -> (parent key, key).
+DUMP_SECTIONS = {
+    "trending": (None, "trending"),
+    "search_users": (None, "search_users"),
+    "user_videos": ("user", "videos"),
+    "user_liked": ("user", "liked"),
+    "user_playlists": ("user", "playlists"),
+    "hashtag_videos": ("hashtag", "videos"),
+    "sound_videos": ("sound", "videos"),
+    "video_comments": ("video", "comments"),
+    "video_related": ("video", "related"),
+    "downloads": (None, "downloads"),
+}
+
+
+def _write_dump(directory: str, output: Dict[str, Any], compression: str) -> None:
+    # One NDJSON file per item list, compressed; summary.json keeps counts,
+    # keys, info payloads and errors (without the lists).
+    os.makedirs(directory, exist_ok=True)
+    data = dict(output["data"])
+    for parent in ("user", "hashtag", "sound", "video"):
+        data[parent] = dict(data[parent])
+    files = {}
+    for name, (parent, key) in DUMP_SECTIONS.items():
+        holder = data[parent] if parent else data
+        items = holder.pop(key, None)
+        if not items:
+            continue
+        path = os.path.join(directory, f"{name}.ndjson{SUFFIXES[compression]}")
+        write_ndjson(path, items, compression)
+        files[name] = os.path.basename(path)
+    summary = dict(output, data=data, files=files)
+    with open(os.path.join(directory, "summary.json"), "w", encoding="utf-8") as handle:
+        json.dump(summary, handle, ensure_ascii=False, indent=2, default=str)
+    print(f"Wrote {len(files)} section files and summary.json to {directory}")
+
+
+def _video_key(video: Any) -> Any:
+    return video.as_dict.get("id") or id(video)
+
+
+def _username_from_profile(value: str) -> str:
+    # Accepts a profile URL, "@name" or a bare username.
+    value = value.strip()
+    if "/" in value:
+        path = urlparse(value if "://" in value else f"https://{value}").path or ""
+        if not path.startswith("/@"):
+            return ""
+        value = path.split("/@")[1].split("/")[0]
+    return value.lstrip("@")
+
+
+def _read_batch(path: str) -> List[str]:
+    handle = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        lines = [line.strip() for line in handle]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    usernames: Dict[str, None] = {}
+    for line in lines:
+        if not line or line.startswith("#"):
+            continue
+        username = _username_from_profile(line)
+        if not username:
+            sys.stderr.write(f"Skipping batch entry without a username: {line}\n")
+            continue
+        usernames.setdefault(username, None)
+    return list(usernames)
+
+
+async def _fetch_user(
+    api: Any,
+    pool: Any,
+    args: argparse.Namespace,
+    username: str,
+    target: Dict[str, Any],
+    timings: Dict[str, float],
+    collect: Callable[[Any], None],
+    project: Callable[[Any], Any],
+    verbose: bool = True,
+) -> None:
+    # Info first; videos, liked videos and playlists then run side by side.
+    user = api.user(username=username)
+
+    async def user_videos(session_index: int) -> None:
+        target["videos"] = []
+        if verbose:
+            sys.stderr.write(f"Fetching user videos: {args.user_videos}\n")
+        async for video in user.videos(count=args.user_videos, session_index=session_index):
+            target["videos"].append(project(video.as_dict))
+            collect(video)
+
+    async def user_liked(session_index: int) -> None:
+        target["liked"] = []
+        if verbose:
+            sys.stderr.write(f"Fetching user liked videos: {args.user_likes}\n")
+        async for video in user.liked(count=args.user_likes, session_index=session_index):
+            target["liked"].append(project(video.as_dict))
+
+    async def user_playlists(session_index: int) -> None:
+        target["playlists"] = []
+        if verbose:
+            sys.stderr.write(f"Fetching user playlists: {args.user_playlists}\n")
+        async for playlist in user.playlists(count=args.user_playlists, session_index=session_index):
+            target["playlists"].append(project(playlist.as_dict))
+
+    if verbose:
+        sys.stderr.write(f"Fetching user info: {username}\n")
+    ok = await run_section(
+        pool, timings, "user_info", target, "info",
+        lambda session_index: _store(target, "info", user.info(session_index=session_index)),
+    )
+    if not ok:
+        target["videos"] = []
+        if verbose:
+            sys.stderr.write("User info failed; skipping video fetch.\n")
+        return
+    # Liked videos and playlists are often private; their errors are reported, not fatal.
+    parts = [run_section(pool, timings, "user_videos", target, "videos", user_videos)]
+    if args.user_likes > 0:
+        parts.append(run_section(pool, timings, "user_liked", target, "liked", user_liked))
+    if args.user_playlists > 0:
+        parts.append(run_section(pool, timings, "user_playlists", target, "playlists", user_playlists))
+    await asyncio.gather(*parts)
+
+
+async def _run_batch(
+    api: Any,
+    pool: Any,
+    args: argparse.Namespace,
+    usernames: List[str],
+    project: Callable[[Any], Any],
+    store: Any,
+) -> int:
+    # The profiles share one session pool; run_batch writes each profile's
+    # NDJSON line as soon as it completes. With --download-videos a profile's
+    # videos are downloaded before its line is written, so only the profiles
+    # in flight hold Video objects.
+    concurrency = args.batch_concurrency if args.batch_concurrency > 0 else len(pool)
+    sys.stderr.write(f"Batch: {len(usernames)} profiles, {concurrency} at a time\n")
+
+    async def fetch(username: str) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"username": username}
+        timings: Dict[str, float] = {}
+        videos: Dict[Any, Any] = {}
+
+        def collect(video: Any) -> None:
+            if args.download_videos:
+                videos.setdefault(_video_key(video), video)
+
+        await _fetch_user(api, pool, args, username, record, timings, collect, project, verbose=False)
+        if videos:
+            started = time.perf_counter()
+            record["downloads"] = await download_videos(
+                list(videos.values()), store, pool, args.download_concurrency
+            )
+            timings["downloads"] = round(time.perf_counter() - started, 3)
+        record["seconds"] = timings
+        return record
+
+    def describe(record: Dict[str, Any]) -> str:
+        status = "error" if "info_error" in record else f"{len(record.get('videos', []))} videos"
+        if "downloads" in record:
+            saved = sum("sha256" in item for item in record["downloads"])
+            status += f", {saved}/{len(record['downloads'])} downloaded"
+        return status
+
+    output = open_dump(args.batch_output, args.compress) if args.batch_output else sys.stdout
+    try:
+        return await run_batch(usernames, fetch, output, concurrency, describe)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
 async def run(args: argparse.Namespace) -> None:
-    ms_token = _get_ms_token()
-    if not ms_token:
-        raise SystemExit(
-            "Missing ms_token. Set env var ms_token or MS_TOKEN from your tiktok.com cookies."
-        )
+    ms_tokens = load_ms_tokens(args.tokens_file)
 
     sys.stderr.write("Starting TikTok scrape...\n")
     sys.stderr.write(f"Python: {sys.version.split()[0]}\n")
-    sys.stderr.write(f"Browser: {os.getenv('TIKTOK_BROWSER', 'chromium')}\n")
-    sys.stderr.write(f"ms_token length: {len(ms_token)}\n")
+    sys.stderr.write(f"Browser: {args.browser}\n")
+    sys.stderr.write(f"ms_tokens: {len(ms_tokens)}\n")
 
     if args.profile_url and not args.username:
-        parsed = urlparse(args.profile_url)
-        path = parsed.path or ""
-        if path.startswith("/@"):
-            args.username = path.split("/@")[1].split("/")[0]
+        args.username = _username_from_profile(args.profile_url)
         if not args.username:
             raise SystemExit("Could not extract username from profile URL.")
+    check_compression(args.compress, args.batch_output)
+    batch = _read_batch(args.batch) if args.batch else []
+    if args.batch and not batch:
+        raise SystemExit(f"No usernames found in {args.batch}.")
 
     results: Dict[str, Any] = {
         "trending": [],
@@ -52,16 +248,19 @@ async def run(args: argparse.Namespace) -> None:
         "video": {},
     }
 
+    pool = open_pool(args, session_count(args, ms_tokens))
+    timings: Dict[str, float] = {}
+    project = Projection(args.fields)
+    store = VideoStore(args.video_dir) if args.video_bytes or args.download_videos else None
+    # Video objects kept for --download-videos, keyed by id so each is fetched once.
+    to_download: Dict[Any, Any] = {}
+
+    def collect(video: Any) -> None:
+        if args.download_videos:
+            to_download.setdefault(_video_key(video), video)
     async with TikTokApi() as api:
-        sys.stderr.write("Creating TikTokApi session...\n")
         try:
-            await api.create_sessions(
-                ms_tokens=[ms_token],
-                num_sessions=1,
-                sleep_after=3,
-                browser=os.getenv("TIKTOK_BROWSER", "chromium"),
-            )
-            sys.stderr.write("Session created.\n")
+            await start_sessions(api, args, ms_tokens, pool, load_proxies(args.proxy, args.proxies_file))
         except Exception as exc:  # noqa: BLE001
             results["session_error"] = str(exc)
             results["session_trace"] = traceback.format_exc()
@@ -77,6 +276,8 @@ async def run(args: argparse.Namespace) -> None:
                     "sound_videos": 0,
                     "video_comments": 0,
                     "video_related": 0,
+                    "downloads": 0,
+                    "seconds": timings,
                 },
                 "keys": {
                     "user_info": [],
@@ -89,92 +290,115 @@ async def run(args: argparse.Namespace) -> None:
             print(json.dumps(output, ensure_ascii=False, indent=2))
             return
 
-        if args.trending > 0:
+        async def trending(session_index: int) -> None:
             sys.stderr.write(f"Fetching trending videos: {args.trending}\n")
-            async for video in api.trending.videos(count=args.trending):
-                results["trending"].append(video.as_dict)
+            async for video in api.trending.videos(count=args.trending, session_index=session_index):
+                results["trending"].append(project(video.as_dict))
+                collect(video)
+
+        async def search(session_index: int) -> None:
+            sys.stderr.write(f"Searching users for: {args.search}\n")
+            async for user in api.search.users(args.search, count=args.search_count, session_index=session_index):
+                results["search_users"].append(project(user.as_dict))
+
+        async def hashtag_section(session_index: int) -> None:
+            sys.stderr.write(f"Fetching hashtag info: {args.hashtag}\n")
+            hashtag = api.hashtag(name=args.hashtag)
+            results["hashtag"]["info"] = await hashtag.info(session_index=session_index)
+            results["hashtag"]["videos"] = []
+            async for video in hashtag.videos(count=args.hashtag_videos, session_index=session_index):
+                results["hashtag"]["videos"].append(project(video.as_dict))
+                collect(video)
+
+        async def sound_section(session_index: int) -> None:
+            sys.stderr.write(f"Fetching sound info: {args.sound_id}\n")
+            sound = api.sound(id=args.sound_id)
+            results["sound"]["info"] = await sound.info(session_index=session_index)
+            results["sound"]["videos"] = []
+            async for video in sound.videos(count=args.sound_videos, session_index=session_index):
+                results["sound"]["videos"].append(project(video.as_dict))
+                collect(video)
+
+        async def video_comments(session_index: int) -> None:
+            results["video"]["comments"] = []
+            sys.stderr.write(f"Fetching video comments: {args.video_comments}\n")
+            async for comment in video.comments(count=args.video_comments, session_index=session_index):
+                results["video"]["comments"].append(project(comment.as_dict))
+
+        async def video_related(session_index: int) -> None:
+            results["video"]["related"] = []
+            sys.stderr.write(f"Fetching related videos: {args.video_related}\n")
+            async for related in video.related_videos(count=args.video_related, session_index=session_index):
+                results["video"]["related"].append(project(related.as_dict))
+                collect(related)
+
+        async def video_bytes(session_index: int) -> None:
+            sys.stderr.write(f"Downloading video to {args.video_dir}...\n")
+            # Only path, size and sha256 go into the output; the bytes stay on disk.
+            results["video"]["file"] = await download_video(video, store, session_index)
+
+        async def video_section() -> None:
+            sys.stderr.write("Fetching video info...\n")
+            ok = await run_section(
+                pool, timings, "video_info", results["video"], "info",
+                lambda session_index: _store(results["video"], "info", video.info(session_index=session_index)),
+            )
+            if not ok:
+                return
+            parts = [
+                run_section(pool, timings, "video_comments", results["video"], "comments", video_comments),
+                run_section(pool, timings, "video_related", results["video"], "related", video_related),
+            ]
+            if args.video_bytes and args.download_videos:
+                # Fetched once, with the bulk downloads; that entry becomes "file".
+                collect(video)
+            elif args.video_bytes:
+                parts.append(run_section(pool, timings, "video_bytes", results["video"], "bytes", video_bytes))
+            await asyncio.gather(*parts)
+
+        if batch:
+            started = time.perf_counter()
+            done = await _run_batch(api, pool, args, batch, project, store)
+            if store:
+                sys.stderr.write(store.summary() + "\n")
+            sys.stderr.write(f"Batch complete: {done} profiles in {time.perf_counter() - started:.1f}s\n")
+            return
 
+        # Sections are independent, so they run side by side over the session
+        # pool; each records its own *_error/*_trace and wall time.
+        sections = []
+        if args.trending > 0:
+            sections.append(run_section(pool, timings, "trending", results, "trending", trending))
         if args.search:
-            try:
-                sys.stderr.write(f"Searching users for: {args.search}\n")
-                async for user in api.search.users(args.search, count=args.search_count):
-                    results["search_users"].append(user.as_dict)
-            except Exception as exc:  # noqa: BLE001
-                results["search_error"] = str(exc)
-                results["search_trace"] = traceback.format_exc()
-
+            sections.append(run_section(pool, timings, "search_users", results, "search", search))
         if args.username:
-            sys.stderr.write(f"Fetching user info: {args.username}\n")
-            user = api.user(username=args.username)
-            try:
-                results["user"]["info"] = await user.info()
-            except Exception as exc:  # noqa: BLE001
-                results["user"]["info_error"] = str(exc)
-                results["user"]["info_trace"] = traceback.format_exc()
-                results["user"]["videos"] = []
-                sys.stderr.write("User info failed; skipping video fetch.\n")
-                user = None
-
-            if user is not None:
-                results["user"]["videos"] = []
-                sys.stderr.write(f"Fetching user videos: {args.user_videos}\n")
-                async for video in user.videos(count=args.user_videos):
-                    results["user"]["videos"].append(video.as_dict)
-
-            if user is not None:
-                try:
-                    results["user"]["liked"] = []
-                    sys.stderr.write(f"Fetching user liked videos: {args.user_likes}\n")
-                    async for video in user.liked(count=args.user_likes):
-                        results["user"]["liked"].append(video.as_dict)
-                except Exception as exc:  # noqa: BLE001 - report API privacy errors
-                    results["user"]["liked_error"] = str(exc)
-                    results["user"]["liked_trace"] = traceback.format_exc()
-
-            if user is not None:
-                try:
-                    results["user"]["playlists"] = []
-                    sys.stderr.write(f"Fetching user playlists: {args.user_playlists}\n")
-                    async for playlist in user.playlists(count=args.user_playlists):
-                        results["user"]["playlists"].append(playlist.as_dict)
-                except Exception as exc:  # noqa: BLE001 - report API errors
-                    results["user"]["playlists_error"] = str(exc)
-                    results["user"]["playlists_trace"] = traceback.format_exc()
-
-            if args.hashtag:
-                sys.stderr.write(f"Fetching hashtag info: {args.hashtag}\n")
-                hashtag = api.hashtag(name=args.hashtag)
-                results["hashtag"]["info"] = await hashtag.info()
-                results["hashtag"]["videos"] = []
-                async for video in hashtag.videos(count=args.hashtag_videos):
-                    results["hashtag"]["videos"].append(video.as_dict)
-
-            if args.sound_id:
-                sys.stderr.write(f"Fetching sound info: {args.sound_id}\n")
-                sound = api.sound(id=args.sound_id)
-                results["sound"]["info"] = await sound.info()
-                results["sound"]["videos"] = []
-                async for video in sound.videos(count=args.sound_videos):
-                    results["sound"]["videos"].append(video.as_dict)
-
-            if args.video_id or args.video_url:
-                sys.stderr.write("Fetching video info...\n")
-                video = api.video(id=args.video_id, url=args.video_url)
-                results["video"]["info"] = await video.info()
-
-                results["video"]["comments"] = []
-                sys.stderr.write(f"Fetching video comments: {args.video_comments}\n")
-                async for comment in video.comments(count=args.video_comments):
-                    results["video"]["comments"].append(comment.as_dict)
-
-                results["video"]["related"] = []
-                sys.stderr.write(f"Fetching related videos: {args.video_related}\n")
-                async for related in video.related_videos(count=args.video_related):
-                    results["video"]["related"].append(related.as_dict)
-
-                if args.video_bytes:
-                    sys.stderr.write("Fetching video bytes...\n")
-                    results["video"]["bytes"] = await video.bytes()
+            sections.append(
+                _fetch_user(api, pool, args, args.username, results["user"], timings, collect, project)
+            )
+        if args.hashtag:
+            sections.append(run_section(pool, timings, "hashtag", results["hashtag"], "section", hashtag_section))
+        if args.sound_id:
+            sections.append(run_section(pool, timings, "sound", results["sound"], "section", sound_section))
+        if args.video_id or args.video_url:
+            video = api.video(id=args.video_id, url=args.video_url)
+            sections.append(video_section())
+        started = time.perf_counter()
+        await asyncio.gather(*sections)
+        if to_download:
+            sys.stderr.write(
+                f"Downloading {len(to_download)} videos ({args.download_concurrency} at a time)...\n"
+            )
+            downloads_started = time.perf_counter()
+            results["downloads"] = await download_videos(
+                list(to_download.values()), store, pool, args.download_concurrency
+            )
+            timings["downloads"] = round(time.perf_counter() - downloads_started, 3)
+            if args.video_bytes and "info" in results["video"]:
+                downloaded = dict(zip(to_download, results["downloads"]))
+                results["video"]["file"] = downloaded.get(_video_key(video))
+        timings["total"] = round(time.perf_counter() - started, 3)
+        if store:
+            sys.stderr.write(store.summary() + "\n")
 
     sys.stderr.write("TikTok scrape complete.\n")
 
@@ -189,6 +413,8 @@ async def run(args: argparse.Namespace) -> None:
             "sound_videos": len(results["sound"].get("videos", [])),
             "video_comments": len(results["video"].get("comments", [])),
             "video_related": len(results["video"].get("related", [])),
+            "downloads": len([item for item in results.get("downloads", []) if "sha256" in item]),
+            "seconds": timings,
         },
         "keys": {
             "user_info": sorted((results["user"].get("info") or {}).keys()),
@@ -199,7 +425,9 @@ async def run(args: argparse.Namespace) -> None:
         "data": results,
     }
 
-    if args.output:
+    if args.dump_dir:
+        _write_dump(args.dump_dir, output, "gzip" if args.compress == "auto" else args.compress)
+    elif args.output:
         with open(args.output, "w", encoding="utf-8") as handle:
             json.dump(output, handle, ensure_ascii=False, indent=2)
         print(f"Wrote output to {args.output}")
@@ -219,6 +447,19 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--user-videos", type=int, default=5)
     parser.add_argument("--user-likes", type=int, default=3)
     parser.add_argument("--user-playlists", type=int, default=3)
+    parser.add_argument(
+        "--batch",
+        type=str,
+        default="",
+        help="File of usernames/profile URLs, one per line ('-' = stdin); writes one NDJSON line per profile",
+    )
+    parser.add_argument("--batch-output", type=str, default="", help="NDJSON output for --batch (default: stdout)")
+    parser.add_argument(
+        "--batch-concurrency",
+        type=int,
+        default=0,
+        help="Profiles fetched at once in --batch (default: one per session)",
+    )
 
     parser.add_argument("--hashtag", type=str, default="")
     parser.add_argument("--hashtag-videos", type=int, default=5)
@@ -230,9 +471,20 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--video-url", type=str, default="")
     parser.add_argument("--video-comments", type=int, default=5)
     parser.add_argument("--video-related", type=int, default=5)
-    parser.add_argument("--video-bytes", action="store_true")
+    parser.add_argument(
+        "--video-bytes", action="store_true", help="Download --video-id/--video-url to --video-dir"
+    )
+    parser.add_argument(
+        "--download-videos",
+        action="store_true",
+        help="Also download every video fetched above (trending, user, hashtag, sound, related)",
+    )
+    add_download_arguments(parser)
+    add_dump_arguments(parser)
 
     parser.add_argument("--output", type=str, default="")
+    add_browser_arguments(parser)
+    add_session_arguments(parser)
     return parser
 
 
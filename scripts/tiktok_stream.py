@@ -0,0 +1,19 @@
+import argparse
+
+from tiktok_core.stream import compact
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compact a discovery NDJSON stream into the sorted creators CSV."
+    )
+    parser.add_argument("stream", type=str)
+    parser.add_argument("--output", type=str, required=True)
+    parser.add_argument("--json-output", type=str, default="")
+    parser.add_argument("--min-followers", type=int, default=0)
+    return parser
+
+
+if __name__ == "__main__":
+    cli_args = build_parser().parse_args()
+    compact(cli_args.stream, cli_args.output, cli_args.json_output, cli_args.min_followers)
@@ -0,0 +1,28 @@
+-- Handles are stored lowercase without '@' (see normalize_tiktok_handle /
+-- normalize_instagram_handle in scripts/import_utils.py); fill the ones
+-- earlier imports left empty from the profile URLs. The patterns are
+-- _TIKTOK_HANDLE / _INSTAGRAM_HANDLE verbatim, anchored and terminated the
+-- same way, so a backfilled handle always equals what an import computes.
+update creators
+set tiktok_handle = lower(substring(
+  tiktok_url
+  from '(?i)^\s*(?:(?:https?://)?(?:(?:www|m)\.)?tiktok\.com/)?@([a-z0-9_.]{2,24})(?=[/?#\s]|$)'
+))
+where tiktok_handle is null
+  and tiktok_url is not null;
+
+update creators
+set instagram_handle = lower(substring(
+  instagram_url
+  from '(?i)^\s*(?:(?:(?:https?://)?(?:(?:www|m)\.)?(?:instagram\.com|instagr\.am)/)|@)'
+    '(?!(?:p|reel|reels|stories|explore|tv|accounts|direct)(?:[/?#]|$))'
+    '([a-z0-9_.]{1,30})(?=[/?#\s]|$)'
+))
+where instagram_handle is null
+  and instagram_url is not null;
+
+create index if not exists creators_tiktok_handle_idx
+  on creators(tiktok_handle);
+
+create index if not exists creators_instagram_handle_idx
+  on creators(instagram_handle);